@@ -7,11 +7,12 @@ import os
 import re
 import sys
 import webbrowser
-from collections.abc import Awaitable
-from contextlib import asynccontextmanager
+from collections.abc import Awaitable, Callable, Iterator, Sequence
+from contextlib import asynccontextmanager, contextmanager
 from dataclasses import asdict, dataclass, field
 from datetime import UTC, datetime, timedelta
 from enum import StrEnum
+from operator import attrgetter
 from pathlib import Path
 from typing import NoReturn
 from urllib.parse import urlparse
@@ -24,9 +25,12 @@ from nio import (
     ReactionEvent,
     RedactedEvent,
     RoomMessageText,
+    SyncError,
+    SyncResponse,
 )
 from pydantic import BaseModel, Field, field_validator
 from rich.console import Console
+from rich.markup import escape
 from rich.panel import Panel
 from rich.table import Table
 
@@ -104,6 +108,9 @@ class ServerState(BaseModel):
 
 # State storage - single state per matty instance
 _state: ServerState | None = None
+# Set inside _batched_state_save(); saves are then written once on exit
+_state_save_deferred = False
+_state_save_pending = False
 
 
 class MessageFetchError(Exception):
@@ -158,8 +165,7 @@ def _load_state() -> ServerState:
     state_file = _get_state_file(config.homeserver)
 
     if state_file.exists():
-        with state_file.open() as f:
-            _state = ServerState.model_validate(json.load(f))
+        _state = ServerState.model_validate_json(state_file.read_bytes())
     else:
         _state = ServerState()
 
@@ -168,14 +174,43 @@ def _load_state() -> ServerState:
 
 def _save_state() -> None:
     """Save the current state."""
+    global _state_save_pending  # noqa: PLW0603
+
     if _state is None:
         return
 
+    if _state_save_deferred:
+        _state_save_pending = True
+        return
+
     config = _load_config()
     state_file = _get_state_file(config.homeserver)
 
-    with state_file.open("w") as f:
-        json.dump(_state.model_dump(), f, indent=2)
+    # Pydantic's JSON encoder runs in Rust and writes the file in one call.
+    state_file.write_text(_state.model_dump_json(indent=2), encoding="utf-8")
+
+
+@contextmanager
+def _batched_state_save() -> Iterator[None]:
+    """Write the state file once at the end of the block instead of per new mapping.
+
+    Assigning handles to a freshly fetched page of messages can mint dozens of
+    IDs; without batching each one rewrites the whole state file.
+    """
+    global _state_save_deferred, _state_save_pending  # noqa: PLW0603
+
+    if _state_save_deferred:
+        yield
+        return
+
+    _state_save_deferred = True
+    try:
+        yield
+    finally:
+        _state_save_deferred = False
+        if _state_save_pending:
+            _state_save_pending = False
+            _save_state()
 
 
 def _get_or_create_mapping(
@@ -445,7 +480,7 @@ def _build_edit_content(
 # =============================================================================
 
 
-@dataclass
+@dataclass(slots=True)
 class Config:
     """Configuration from environment."""
 
@@ -458,7 +493,7 @@ class Config:
     access_token: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Room:
     """Room information."""
 
@@ -469,7 +504,7 @@ class Room:
     users: list[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class Message:
     """Message data."""
 
@@ -662,28 +697,25 @@ def _missing_credentials_message() -> str:
     )
 
 
-async def _sync_client(client: AsyncClient, timeout: int = 10000) -> None:
-    """Sync client with server."""
-    await client.sync(timeout=timeout)
+async def _sync_client(client: AsyncClient, timeout: int = 10000) -> SyncResponse | SyncError:
+    """Sync client with server and return the sync response."""
+    return await client.sync(timeout=timeout)
 
 
 async def _get_rooms(client: AsyncClient) -> list[Room]:
     """Get list of rooms from client."""
     await _sync_client(client)
 
-    rooms = []
-    for room_id, matrix_room in client.rooms.items():
-        rooms.append(
-            Room(
-                room_id=room_id,
-                name=matrix_room.display_name or room_id,
-                member_count=len(matrix_room.users),
-                topic=matrix_room.topic,
-                users=list(matrix_room.users.keys()),
-            )
+    return [
+        Room(
+            room_id=room_id,
+            name=matrix_room.display_name or room_id,
+            member_count=len(matrix_room.users),
+            topic=matrix_room.topic,
+            users=list(matrix_room.users.keys()),
         )
-
-    return rooms
+        for room_id, matrix_room in client.rooms.items()
+    ]
 
 
 async def _find_room(client: AsyncClient, room_query: str) -> tuple[str, str] | None:
@@ -740,18 +772,19 @@ def _get_event_id_from_handle(room_id: str, handle: str) -> str | None:
 
 def _assign_message_handles(messages: list[Message]) -> list[Message]:
     """Assign stable handles to messages."""
-    for msg in messages:
-        if msg.event_id and msg.room_id:
-            # Get or create stable handle for this message
-            msg.handle = _get_or_create_handle(msg.room_id, msg.event_id)
-
-        # Handle thread IDs (using existing system)
-        if msg.is_thread_root and msg.event_id:
-            thread_simple_id = _get_or_create_id(msg.event_id)
-            msg.thread_handle = f"t{thread_simple_id}"
-        elif msg.thread_root_id:
-            thread_simple_id = _get_or_create_id(msg.thread_root_id)
-            msg.thread_handle = f"t{thread_simple_id}"
+    with _batched_state_save():
+        for msg in messages:
+            if msg.event_id and msg.room_id:
+                # Get or create stable handle for this message
+                msg.handle = _get_or_create_handle(msg.room_id, msg.event_id)
+
+            # Handle thread IDs (using existing system)
+            if msg.is_thread_root and msg.event_id:
+                thread_simple_id = _get_or_create_id(msg.event_id)
+                msg.thread_handle = f"t{thread_simple_id}"
+            elif msg.thread_root_id:
+                thread_simple_id = _get_or_create_id(msg.thread_root_id)
+                msg.thread_handle = f"t{thread_simple_id}"
 
     return messages
 
@@ -899,15 +932,8 @@ async def _get_thread_messages(
     messages = await _get_messages(client, room_id, limit)
 
     # Find the thread root and replies
-    thread_messages = []
-    root_found = False
-
-    for msg in messages:
-        if msg.event_id == thread_id:
-            thread_messages.append(msg)
-            root_found = True
-        elif msg.thread_root_id == thread_id:
-            thread_messages.append(msg)
+    thread_messages = [msg for msg in messages if thread_id in (msg.event_id, msg.thread_root_id)]
+    root_found = any(msg.event_id == thread_id for msg in thread_messages)
 
     # If we didn't find the root message but found replies, the root might be deleted or out of range
     # Add a placeholder for the missing root message
@@ -926,7 +952,7 @@ async def _get_thread_messages(
         )
         thread_messages.insert(0, placeholder)
 
-    return sorted(thread_messages, key=lambda m: m.timestamp)
+    return sorted(thread_messages, key=attrgetter("timestamp"))
 
 
 def _get_room_users(client: AsyncClient, room_id: str) -> list[str]:
@@ -935,7 +961,10 @@ def _get_room_users(client: AsyncClient, room_id: str) -> list[str]:
     return list(room.users.keys()) if room else []
 
 
-def _parse_mentions(message: str, room_users: list[str]) -> tuple[str, str | None, list[str]]:
+_MENTION_RE = re.compile(r"@(\S+)")
+
+
+def _parse_mentions(message: str, room_users: Sequence[str]) -> tuple[str, str | None, list[str]]:
     """Parse @mentions in message and return (body, formatted_body, mentioned_user_ids).
 
     Handles:
@@ -949,12 +978,13 @@ def _parse_mentions(message: str, room_users: list[str]) -> tuple[str, str | Non
     body = message
     mentioned_user_ids = []
 
-    # Find all @mentions in the message
-    mention_pattern = r"@(\S+)"
-    mentions = re.findall(mention_pattern, message)
+    # Find all @mentions in the message, keeping first-seen order without duplicates
+    mentions = list(dict.fromkeys(_MENTION_RE.findall(message)))
 
     if mentions:
         formatted_body = message
+        # Lowercase the room users once rather than once per mention
+        lowered_users: list[tuple[str, str]] | None = None
         for mention in mentions:
             user_id = None
 
@@ -962,10 +992,14 @@ def _parse_mentions(message: str, room_users: list[str]) -> tuple[str, str | Non
             if ":" in mention:
                 user_id = f"@{mention}"
             else:
-                # Try to find a matching user in the room
-                for room_user in room_users:
+                if lowered_users is None:
+                    lowered_users = [(room_user, room_user.lower()) for room_user in room_users]
+                prefix = f"@{mention}:"
+                needle = mention.lower()
+                # Try to find a matching user in the room, in room order
+                for room_user, lowered in lowered_users:
                     # Match by local part (before :) or display name
-                    if room_user.startswith(f"@{mention}:") or mention.lower() in room_user.lower():
+                    if room_user.startswith(prefix) or needle in lowered:
                         user_id = room_user
                         break
 
@@ -1083,6 +1117,15 @@ async def _get_message_by_handle(
 # =============================================================================
 
 
+def _format_timestamp(timestamp: datetime) -> str:
+    """Format a message timestamp as HH:MM.
+
+    Equivalent to ``strftime("%H:%M")`` but skips the format-string parsing,
+    which adds up when rendering every message in a room.
+    """
+    return f"{timestamp.hour:02d}:{timestamp.minute:02d}"
+
+
 def _display_rooms_rich(rooms: list[Room]) -> None:
     """Display rooms in rich table format."""
     table = Table(title="Matrix Rooms", show_lines=True)
@@ -1112,8 +1155,10 @@ def _display_messages_rich(messages: list[Message], room_name: str) -> None:
     """Display messages in rich format with thread indicators, message handles, and reactions."""
     console.print(Panel(f"[bold cyan]{room_name}[/bold cyan]", expand=False))
 
+    # Collect every line and print once: each console.print is a full render pass.
+    lines: list[str] = []
     for msg in messages:
-        time_str = msg.timestamp.strftime("%H:%M")
+        time_str = _format_timestamp(msg.timestamp)
         prefix = ""
 
         # Add thread indicators
@@ -1126,29 +1171,32 @@ def _display_messages_rich(messages: list[Message], room_name: str) -> None:
         handle = f"[bold magenta]{msg.handle}[/bold magenta]"
 
         # Show the message with handle
-        console.print(
-            f"{handle} {prefix}[dim]{time_str}[/dim] [cyan]{msg.sender}[/cyan]: {msg.content}"
+        lines.append(
+            f"{handle} {prefix}[dim]{time_str}[/dim] [cyan]{msg.sender}[/cyan]: "
+            # Escape so markup-like text in one message can't style the rest of the batch
+            f"{escape(msg.content)}"
         )
 
         # Show reactions if any
         if msg.reactions:
             reaction_str = " ".join(
-                f"{emoji} {len(users)}" for emoji, users in msg.reactions.items()
+                f"{escape(emoji)} {len(users)}" for emoji, users in msg.reactions.items()
             )
-            console.print(f"    [dim]Reactions: {reaction_str}[/dim]")
+            lines.append(f"    [dim]Reactions: {reaction_str}[/dim]")
 
     # Show available actions
     if messages:
-        console.print(
+        lines.append(
             "\n[dim]Use handles (m1, m2, etc.) or thread IDs (t1, t2, etc.) with commands[/dim]"
         )
+        console.print("\n".join(lines))
 
 
 def _display_messages_simple(messages: list[Message], room_name: str) -> None:
     """Display messages in simple format with handles and reactions."""
     print(f"=== {room_name} ===")
     for msg in messages:
-        time_str = msg.timestamp.strftime("%H:%M")
+        time_str = _format_timestamp(msg.timestamp)
         thread_mark = ""
         if msg.is_thread_root and msg.thread_handle:
             thread_mark = f" [THREAD {msg.thread_handle}]"
@@ -1369,10 +1417,19 @@ async def _execute_send_command(
         await client.close()
 
 
+def _event_loop_factory() -> Callable[[], asyncio.AbstractEventLoop] | None:
+    """Return uvloop's loop factory if it is installed, else None for the default loop."""
+    try:
+        import uvloop  # noqa: PLC0415
+    except ImportError:
+        return None
+    return uvloop.new_event_loop
+
+
 def _run_async_command(coro: Awaitable[None]) -> None:
     """Run an async CLI command and surface fetch failures as CLI errors."""
     try:
-        asyncio.run(coro)
+        asyncio.run(coro, loop_factory=_event_loop_factory())
     except MessageFetchError as exc:
         console.print(f"[red]{exc}[/red]")
         raise typer.Exit(1) from exc
@@ -1785,7 +1842,7 @@ def threads(  # pragma: no cover
                 table.add_column("Thread Start", style="green")
 
                 for thread in threads:
-                    time_str = thread.timestamp.strftime("%H:%M")
+                    time_str = _format_timestamp(thread.timestamp)
                     # Truncate content for display
                     content = (
                         thread.content[:50] + "..." if len(thread.content) > 50 else thread.content
@@ -1799,7 +1856,7 @@ def threads(  # pragma: no cover
             elif format == OutputFormat.simple:
                 print(f"=== Threads in {room_name} ===")
                 for thread in threads:
-                    time_str = thread.timestamp.strftime("%H:%M")
+                    time_str = _format_timestamp(thread.timestamp)
                     print(
                         f"[{time_str}] {thread.sender}: {thread.content[:50]}... (ID: {thread.event_id})"
                     )
@@ -1863,7 +1920,7 @@ def thread(  # pragma: no cover
                 )
 
                 for msg in thread_messages:
-                    time_str = msg.timestamp.strftime("%H:%M")
+                    time_str = _format_timestamp(msg.timestamp)
                     if msg.event_id == actual_thread_id:
                         # Thread root
                         console.print("[bold yellow]🧵 Thread Start[/bold yellow]")
@@ -1879,7 +1936,7 @@ def thread(  # pragma: no cover
             elif format == OutputFormat.simple:
                 print(f"=== Thread in {room_name} ===")
                 for msg in thread_messages:
-                    time_str = msg.timestamp.strftime("%H:%M")
+                    time_str = _format_timestamp(msg.timestamp)
                     prefix = "THREAD START: " if msg.event_id == actual_thread_id else "  > "
                     print(f"{prefix}[{time_str}] {msg.sender}: {msg.content}")
 
@@ -2260,7 +2317,8 @@ def tui():  # pragma: no cover
     """Launch interactive TUI chat interface."""
     from matty.tui import MattyApp  # noqa: PLC0415
 
-    MattyApp().run()
+    with asyncio.Runner(loop_factory=_event_loop_factory()) as runner:
+        runner.run(MattyApp().run_async())
 
 
 if __name__ == "__main__":
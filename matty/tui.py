@@ -3,11 +3,14 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import logging
 from collections import Counter
+from functools import lru_cache
 from pathlib import Path
 from typing import TYPE_CHECKING, ClassVar
 
+from nio import SyncResponse
 from rich.markdown import Markdown as RichMarkdown
 from rich.markup import escape as rich_escape
 from textual import events, work
@@ -32,8 +35,10 @@ from matty.cli import (
     Message,
     Room,
     _authenticate_client,
+    _batched_state_save,
     _create_client,
     _find_room,
+    _format_timestamp,
     _get_event_id_from_handle,
     _get_messages,
     _get_or_create_id,
@@ -50,6 +55,8 @@ from matty.cli import (
 )
 
 if TYPE_CHECKING:
+    from datetime import datetime
+
     from nio import AsyncClient
     from rich.console import RenderableType
 
@@ -60,6 +67,13 @@ POLL_INTERVAL_S = 3
 SYNC_TIMEOUT_MS = 5000
 _MAX_POLL_FAILURES = 5
 _MESSAGE_LIMIT = 50
+# New messages are appended to the pane, so cap how many it may accumulate
+# before redrawing from the (bounded) fetched window.
+_MAX_PANE_MESSAGES = 2 * _MESSAGE_LIMIT
+# Upper bound on in-flight send/command workers per group; beyond this we
+# push back on the user instead of queueing unbounded background tasks.
+_MAX_PENDING_WORKERS = 16
+_SELECT_DEBOUNCE_S = 0.05
 
 
 async def _login_or_restore(client: AsyncClient, config: Config) -> bool:
@@ -78,32 +92,66 @@ def _format_sender(sender: str) -> str:
     return sender
 
 
-def _format_message_line(msg: Message) -> list[RenderableType]:
-    """Format a single message for display in the message pane.
+def _thread_prefix(thread_handle: str | None, *, is_thread_root: bool) -> str:
+    """Return the thread marker shown before a message header."""
+    if not thread_handle:
+        return ""
+    safe_th = rich_escape(thread_handle)
+    if is_thread_root:
+        return f"[bold yellow]🧵 {safe_th}[/bold yellow] "
+    return f"  ↳ [dim yellow]{safe_th}[/dim yellow] "
+
+
+@lru_cache(maxsize=1024)
+def _message_header(
+    handle: str | None,
+    thread_handle: str | None,
+    timestamp: datetime,
+    sender: str,
+    *,
+    is_thread_root: bool,
+) -> str:
+    """Return the header markup (handle, thread marker, time, sender) for a message.
+
+    None of these fields change once a message is fetched, so the timestamp
+    and escaped sender are formatted once per message rather than on every
+    redraw of the room.
+    """
+    time_str = _format_timestamp(timestamp)
+    safe_sender = rich_escape(_format_sender(sender))
+    prefix = _thread_prefix(thread_handle, is_thread_root=is_thread_root)
+    handle_str = f"[bold magenta]{rich_escape(handle)}[/bold magenta] " if handle else ""
+    return f"{handle_str}{prefix}[dim]{time_str}[/dim] [bold cyan]{safe_sender}[/bold cyan]:"
 
-    Returns a list of renderables to write to the RichLog pane.
+
+@lru_cache(maxsize=1024)
+def _reactions_line(counts: tuple[tuple[str, int], ...]) -> str:
+    """Return the reactions summary markup for ``(emoji, count)`` pairs.
+
+    Reactions change far less often than the pane is redrawn, so the escaped
+    summary is reused until the counts actually differ.
     """
-    time_str = msg.timestamp.strftime("%H:%M")
-    sender = rich_escape(_format_sender(msg.sender))
+    reaction_str = " ".join(f"{rich_escape(emoji)} {count}" for emoji, count in counts)
+    return f"       [dim]Reactions: {reaction_str}[/dim]"
 
-    prefix = ""
-    if msg.is_thread_root and msg.thread_handle:
-        safe_th = rich_escape(msg.thread_handle)
-        prefix = f"[bold yellow]🧵 {safe_th}[/bold yellow] "
-    elif msg.thread_handle:
-        safe_th = rich_escape(msg.thread_handle)
-        prefix = f"  ↳ [dim yellow]{safe_th}[/dim yellow] "
 
-    handle = f"[bold magenta]{rich_escape(msg.handle)}[/bold magenta] " if msg.handle else ""
-    header = f"{handle}{prefix}[dim]{time_str}[/dim] [bold cyan]{sender}[/bold cyan]:"
+def _format_message_line(msg: Message) -> list[RenderableType]:
+    """Format a single message for display in the message pane.
 
+    Returns a list of renderables to write to the RichLog pane.
+    """
+    header = _message_header(
+        msg.handle,
+        msg.thread_handle,
+        msg.timestamp,
+        msg.sender,
+        is_thread_root=msg.is_thread_root,
+    )
     parts: list[RenderableType] = [header, RichMarkdown(msg.content)]
 
     if msg.reactions:
-        reaction_str = " ".join(
-            f"{rich_escape(emoji)} {len(users)}" for emoji, users in msg.reactions.items()
-        )
-        parts.append(f"       [dim]Reactions: {reaction_str}[/dim]")
+        counts = tuple((emoji, len(users)) for emoji, users in msg.reactions.items())
+        parts.append(_reactions_line(counts))
 
     return parts
 
@@ -131,12 +179,42 @@ def _messages_changed(old: list[Message], new: list[Message]) -> bool:
     )
 
 
+def _appended_messages(old: list[Message], new: list[Message]) -> list[Message] | None:
+    """Return the messages added after the end of old, or None if new diverges.
+
+    Polling returns a sliding window, so the oldest messages may have been
+    dropped from the front of new; everything old still shares with new has
+    to be unchanged for the result to be a pure append.
+    """
+    if not old or not old[-1].event_id:
+        return None
+    last_id = old[-1].event_id
+    end = next((i + 1 for i in range(len(new) - 1, -1, -1) if new[i].event_id == last_id), 0)
+    if not end or end > len(old):
+        return None
+    if _messages_changed(old[len(old) - end :], new[:end]):
+        return None
+    return new[end:]
+
+
 def _new_message_ids(old: list[Message], new: list[Message]) -> set[str]:
     """Return event IDs present in new but not in old."""
     old_ids = {m.event_id for m in old if m.event_id}
     return {m.event_id for m in new if m.event_id and m.event_id not in old_ids}
 
 
+def _sync_has_room_events(response: object, room_id: str) -> bool:
+    """Return False only if a successful sync carried no timeline events for the room.
+
+    The client's sync token advances on every sync, so an empty timeline means
+    nothing visible changed in the room since the previous poll.
+    """
+    if not isinstance(response, SyncResponse):
+        return True
+    room = response.rooms.join.get(room_id)
+    return room is not None and bool(room.timeline.events)
+
+
 # Keep `/edit` and `/redact` visible for discoverability; they intentionally
 # fall through to the "not yet implemented" notice in `_execute_slash_command`.
 SLASH_COMMANDS: list[tuple[str, str]] = [
@@ -156,17 +234,18 @@ class MessageInput(TextArea):
     class Submitted(TextualMessage):
         """Posted when the user submits the message (Ctrl+S)."""
 
-        def __init__(self, text_area: MessageInput, text: str) -> None:
+        def __init__(self, text_area: MessageInput, text: str, raw_text: str) -> None:
             super().__init__()
             self.text_area = text_area
             self.text = text
+            self.raw_text = raw_text
 
     def submit_message(self) -> bool:
         """Submit the current text as a message and clear the input."""
         text = self.text.strip()
         if not text:
             return False
-        self.post_message(self.Submitted(self, text))
+        self.post_message(self.Submitted(self, text, self.text))
         self.text = ""
         return True
 
@@ -242,6 +321,7 @@ class MattyApp(App):
     BINDINGS: ClassVar[list[Binding]] = [
         Binding("ctrl+q", "quit", "Quit"),
         Binding("ctrl+r", "refresh", "Refresh"),
+        Binding("f5", "refresh_rooms", "Reload rooms"),
         Binding("ctrl+t", "toggle_threads", "Threads"),
         Binding("ctrl+s", "send_message", "Send", show=True),
         Binding("tab", "focus_next", "Next pane", show=False),
@@ -258,7 +338,12 @@ class MattyApp(App):
         self.current_room_name: str = ""
         self.current_thread_id: str | None = None
         self.messages: list[Message] = []
+        # (room_id, thread_id) currently drawn in the message pane, if any
+        self._rendered_view: tuple[str | None, str | None] | None = None
+        self._pane_message_count = 0
+        self._thread_list_key: tuple[tuple[str | None, str], ...] | None = None
         self._polling = False
+        self._poll_wakeup = asyncio.Event()  # Set to run the next poll immediately
         self._threads_visible = True
         self.autocomplete_mode: str | None = None  # "slash" or "mention"
         self._room_users: list[str] = []
@@ -318,7 +403,7 @@ class MattyApp(App):
             self._log_to_pane("Loading rooms...")
             self.rooms = await _get_rooms(client)
             self.client = client
-            self._populate_room_list()
+            await self._populate_room_list()
             self._log_to_pane(f"Connected! {len(self.rooms)} rooms loaded.")
 
             # Auto-select first room (matches sorted order in sidebar)
@@ -349,15 +434,17 @@ class MattyApp(App):
 
     def _log_to_pane(self, text: str) -> None:
         """Write a line to the message pane."""
+        self._rendered_view = None  # Pane no longer shows just the message list
         pane = self.query_one("#message-pane", RichLog)
         pane.write(text)
 
-    def _populate_room_list(self) -> None:
+    async def _populate_room_list(self) -> None:
         """Populate the room sidebar."""
         room_list = self.query_one("#room-list", ListView)
-        room_list.clear()
-        for room in sorted(self.rooms, key=lambda r: r.name.lower()):
-            room_list.append(RoomItem(room))
+        await room_list.clear()
+        await room_list.extend(
+            RoomItem(room) for room in sorted(self.rooms, key=lambda r: r.name.lower())
+        )
 
     async def _select_room(self, room: Room) -> None:
         """Switch to a room and display its messages."""
@@ -371,8 +458,8 @@ class MattyApp(App):
         if self.client:
             self._room_users = _get_room_users(self.client, room.room_id)
 
-        await self._refresh_messages()
-        await self._refresh_threads()
+        # Both hit the homeserver independently, so overlap the round-trips.
+        await asyncio.gather(self._refresh_messages(), self._refresh_threads())
 
     async def _fetch_messages(self) -> list[Message]:
         """Fetch messages for the current room or thread."""
@@ -389,6 +476,8 @@ class MattyApp(App):
         """Render the current messages to the message pane."""
         pane = self.query_one("#message-pane", RichLog)
         pane.clear()
+        self._rendered_view = (self.current_room_id, self.current_thread_id)
+        self._pane_message_count = 0
         safe_room_name = rich_escape(self.current_room_name)
 
         if self.current_thread_id:
@@ -403,28 +492,67 @@ class MattyApp(App):
             pane.write("[dim]No messages yet.[/dim]")
             return
 
-        for msg in self.messages:
+        self._write_messages(self.messages)
+
+    def _write_messages(self, messages: list[Message]) -> None:
+        """Append messages to the bottom of the message pane."""
+        pane = self.query_one("#message-pane", RichLog)
+        for msg in messages:
             for part in _format_message_line(msg):
                 pane.write(part)
+        self._pane_message_count += len(messages)
+
+    def _apply_messages(self, messages: list[Message]) -> None:
+        """Show a new message list, only rendering what was appended if possible."""
+        appended = None
+        if self._rendered_view == (self.current_room_id, self.current_thread_id):
+            appended = _appended_messages(self.messages, messages)
+        self.messages = messages
+        if appended and self._pane_message_count + len(appended) <= _MAX_PANE_MESSAGES:
+            self._write_messages(appended)
+        else:
+            self._render_messages()
 
     async def _refresh_messages(self) -> None:
         """Fetch and display messages for the current room or thread."""
-        self.messages = await self._fetch_messages()
-        self._render_messages()
+        messages = await self._fetch_messages()
+        view = (self.current_room_id, self.current_thread_id)
+        if view == self._rendered_view and not _messages_changed(self.messages, messages):
+            return
+        self._apply_messages(messages)
+
+    async def _fetch_threads(self) -> list[Message]:
+        """Fetch thread roots for the current room."""
+        if not self.client or not self.current_room_id:
+            return []
+
+        threads = await _get_threads(self.client, self.current_room_id, limit=50)
+        return [t for t in threads if t.event_id]
 
     async def _refresh_threads(self) -> None:
         """Fetch and display threads for the current room."""
         if not self.client or not self.current_room_id:
             return
+        self._show_threads(await self._fetch_threads())
+
+    def _show_threads(self, threads: list[Message]) -> None:
+        """Display thread roots in the thread sidebar."""
+        # Polling refetches threads every few seconds; only rebuild the
+        # sidebar widgets (and lose the highlight) when something changed.
+        thread_key = tuple((t.event_id, t.content) for t in threads)
+        if thread_key == self._thread_list_key:
+            return
+        self._thread_list_key = thread_key
 
         thread_list = self.query_one("#thread-list", ListView)
         thread_list.clear()
-
-        threads = await _get_threads(self.client, self.current_room_id, limit=50)
-        for thread_msg in threads:
-            if thread_msg.event_id:
-                simple_id = _get_or_create_id(thread_msg.event_id)
-                thread_list.append(ThreadItem(thread_msg, f"t{simple_id}"))
+        # Mount all items in one batch rather than one append per thread.
+        with _batched_state_save():
+            items = [
+                ThreadItem(thread_msg, f"t{_get_or_create_id(thread_msg.event_id)}")
+                for thread_msg in threads
+            ]
+        thread_list.extend(items)
 
     def _sync_room_list_selection(self, room_id: str) -> None:
         """Update room sidebar highlight to match the active room."""
@@ -440,6 +568,22 @@ class MattyApp(App):
             self._polling = True
             self._poll_messages()
 
+    def _request_poll(self) -> None:
+        """Wake the poll loop so it syncs now instead of after the interval."""
+        self._poll_wakeup.set()
+
+    async def _wait_for_poll(self, delay: float) -> bool:
+        """Wait until the next poll is due or has been requested.
+
+        Returns True if the poll was explicitly requested.
+        """
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(self._poll_wakeup.wait(), timeout=delay)
+        requested = self._poll_wakeup.is_set()
+        # Requests made while waiting collapse into this single poll.
+        self._poll_wakeup.clear()
+        return requested
+
     @work(exclusive=True, group="poll")
     async def _poll_messages(self) -> None:
         """Poll for new messages periodically."""
@@ -450,15 +594,32 @@ class MattyApp(App):
                 delay = min(
                     POLL_INTERVAL_S * 2 ** (self._poll_failures - _MAX_POLL_FAILURES + 1), 60
                 )
-            await asyncio.sleep(delay)
+            requested = await self._wait_for_poll(delay)
             if self.current_room_id and self.client:
                 try:
-                    # Capture selection before async I/O so we can detect
-                    # room/thread switches that happen mid-flight.
+                    synced_selection = (self.current_room_id, self.current_thread_id)
+                    # After a failure the previous sync may have consumed
+                    # events we never fetched, so always refetch then.
+                    must_fetch = requested or self._poll_failures > 0
+                    response = await _sync_client(self.client, timeout=SYNC_TIMEOUT_MS)
+                    # Capture selection after the long-poll so we can detect
+                    # room/thread switches that happen while fetching.
                     snapshot_room = self.current_room_id
                     snapshot_thread = self.current_thread_id
-                    await _sync_client(self.client, timeout=SYNC_TIMEOUT_MS)
-                    new_messages = await self._fetch_messages()
+                    if not snapshot_room:
+                        continue
+                    # A switch during the sync means the new room's refresh may
+                    # predate events this sync just consumed, so refetch.
+                    must_fetch = must_fetch or synced_selection != (snapshot_room, snapshot_thread)
+                    if not must_fetch and not _sync_has_room_events(response, snapshot_room):
+                        self._poll_failures = 0
+                        continue
+                    # Messages and threads are independent round-trips, so
+                    # overlap them; hidden threads catch up when shown again.
+                    fetches = [self._fetch_messages()]
+                    if self._threads_visible:
+                        fetches.append(self._fetch_threads())
+                    new_messages, *new_threads = await asyncio.gather(*fetches)
                     # Discard results if the user switched rooms/threads
                     # while we were fetching.
                     if (
@@ -469,8 +630,7 @@ class MattyApp(App):
                         continue
                     if _messages_changed(self.messages, new_messages):
                         old_messages = self.messages
-                        self.messages = new_messages
-                        self._render_messages()
+                        self._apply_messages(new_messages)
                         new_ids = _new_message_ids(old_messages, new_messages)
                         if new_ids:
                             self.notify(
@@ -478,7 +638,8 @@ class MattyApp(App):
                                 title=self.current_room_name,
                                 timeout=2,
                             )
-                    await self._refresh_threads()
+                    if new_threads:
+                        self._show_threads(new_threads[0])
                     self._poll_failures = 0
                 except Exception:
                     logger.warning("Polling error", exc_info=True)
@@ -490,14 +651,31 @@ class MattyApp(App):
                             timeout=5,
                         )
 
-    async def on_list_view_selected(self, event: ListView.Selected) -> None:
+    def on_list_view_selected(self, event: ListView.Selected) -> None:
         """Handle room or thread selection."""
         item = event.item
         if isinstance(item, RoomItem):
-            await self._select_room(item.room)
+            self._open_selection(item.room, None)
         elif isinstance(item, ThreadItem):
-            self.current_thread_id = item.msg.event_id
-            await self._refresh_messages()
+            self._open_selection(None, item.msg.event_id)
+
+    @work(exclusive=True, group="select")
+    async def _open_selection(self, room: Room | None, thread_id: str | None) -> None:
+        """Open a sidebar selection after a short debounce.
+
+        Each new selection cancels the previous worker, so clicking through
+        several rooms quickly only fetches the one the user settles on.
+        """
+        await asyncio.sleep(_SELECT_DEBOUNCE_S)
+        try:
+            if room is not None:
+                await self._select_room(room)
+            else:
+                self.current_thread_id = thread_id
+                await self._refresh_messages()
+        except Exception:
+            logger.warning("Failed to open selection", exc_info=True)
+            self.notify("Failed to load messages — check connection", severity="error")
 
     async def on_message_input_submitted(self, event: MessageInput.Submitted) -> None:
         """Handle message sending."""
@@ -505,6 +683,13 @@ class MattyApp(App):
         if not text:
             return
 
+        group = "command" if text.startswith("/") else "send"
+        if not self._has_worker_capacity(group):
+            # Hand the unstripped draft back so nothing the user typed is lost.
+            event.text_area.text = event.raw_text
+            self.notify("Still busy with earlier requests — try again shortly", severity="warning")
+            return
+
         # Try slash commands first
         if text.startswith("/"):
             if self._handle_slash_command(text):
@@ -516,6 +701,11 @@ class MattyApp(App):
         # Send regular message
         self._send_user_message(text)
 
+    def _has_worker_capacity(self, group: str) -> bool:
+        """Return True if another worker may be started in the given group."""
+        pending = sum(1 for w in self.workers if w.group == group and not w.is_finished)
+        return pending < _MAX_PENDING_WORKERS
+
     def _handle_slash_command(self, text: str) -> bool:
         """Dispatch a slash command. Returns True if handled."""
         parts = text.split(None, 1)
@@ -543,6 +733,7 @@ class MattyApp(App):
         await self._refresh_messages()
         if threads:
             await self._refresh_threads()
+        self._request_poll()
 
     @work(exclusive=False, group="command")
     async def _execute_slash_command(self, command: str, args: str) -> None:
@@ -550,7 +741,12 @@ class MattyApp(App):
         if command == "/back":
             if self.current_thread_id:
                 self.current_thread_id = None
-                await self._refresh_messages()
+                try:
+                    await self._refresh_messages()
+                except Exception:
+                    # An uncaught worker error would exit the app.
+                    logger.warning("Command %s failed", command, exc_info=True)
+                    self.notify(f"Command failed: {command}", severity="error")
             return
 
         if not self._authenticated:
@@ -651,9 +847,9 @@ class MattyApp(App):
             )
 
             if success:
-                # Refresh to show the sent message
-                await _sync_client(self.client, timeout=SYNC_TIMEOUT_MS)
-                await self._refresh_messages()
+                # Let the poll loop sync and show the sent message rather than
+                # holding this worker for another round-trip.
+                self._request_poll()
             else:
                 self.notify("Failed to send message", severity="error")
         except Exception:
@@ -682,7 +878,8 @@ class MattyApp(App):
     def on_text_area_changed(self, event: TextArea.Changed) -> None:
         """Update autocomplete suggestions as the user types."""
         text = event.text_area.text
-        first_line = text.split("\n")[0]
+        # partition stops at the first newline instead of splitting every line
+        first_line = text.partition("\n")[0]
 
         # Slash command autocomplete: first line starts with "/" and has no space yet
         if first_line.startswith("/") and " " not in first_line:
@@ -787,13 +984,38 @@ class MattyApp(App):
         if self.current_room_id:
             try:
                 await _sync_client(self.client, timeout=SYNC_TIMEOUT_MS)
-                await self._refresh_messages()
-                await self._refresh_threads()
+                # The room list rarely changes; only reload the open room here
+                # and leave the room list to F5. Hidden threads catch
+                # up when the panel is shown again.
+                refreshes = [self._refresh_messages()]
+                if self._threads_visible:
+                    refreshes.append(self._refresh_threads())
+                await asyncio.gather(*refreshes)
                 self.notify("Refreshed", timeout=1)
             except Exception:
                 logger.warning("Refresh failed", exc_info=True)
                 self.notify("Refresh failed — check connection", severity="error")
 
+    async def action_refresh_rooms(self) -> None:
+        """Reload the room list from the homeserver."""
+        if not self._authenticated or not self.client:
+            self.notify("Not connected yet — please wait", severity="warning")
+            return
+
+        try:
+            self.rooms = await _get_rooms(self.client)
+        except Exception:
+            logger.warning("Room reload failed", exc_info=True)
+            self.notify("Room reload failed — check connection", severity="error")
+            return
+
+        await self._populate_room_list()
+        if self.current_room_id:
+            self._sync_room_list_selection(self.current_room_id)
+        # Reloading rooms synced the client, so the poll may have missed events.
+        self._request_poll()
+        self.notify(f"{len(self.rooms)} rooms loaded", timeout=1)
+
     def action_toggle_threads(self) -> None:
         """Toggle thread panel visibility."""
         self._threads_visible = not self._threads_visible
@@ -801,6 +1023,9 @@ class MattyApp(App):
         thread_label = self.query_one("#thread-label", Label)
         thread_list.display = self._threads_visible
         thread_label.display = self._threads_visible
+        if self._threads_visible:
+            # Threads are not refreshed while hidden; catch up now.
+            self._request_poll()
 
     async def on_unmount(self) -> None:
         """Clean up client session when the app unmounts."""
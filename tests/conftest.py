@@ -1,51 +1,62 @@
 """Pytest configuration and fixtures."""
 
-import asyncio
+from dataclasses import dataclass
 from datetime import UTC, datetime
+from functools import cache, partial
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from urllib.parse import urlparse
 
 import pytest
+from nio import LoginResponse, RoomSendResponse
+from typer.testing import CliRunner
 
-from matty import Config, Message, Room
+import matty.cli
+import matty.tui
+from matty import Config, Message, Room, ServerState
 
+# Test server configuration applied to every test
+_TEST_ENV = {
+    "MATRIX_HOMESERVER": "https://test.matrix.org",
+    "MATRIX_USERNAME": "test_user",
+    "MATRIX_PASSWORD": "test_password",
+    "MATRIX_SSL_VERIFY": "false",
+}
 
-@pytest.fixture(scope="session")
-def event_loop():
-    """Create an event loop for the test session."""
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    yield loop
-    loop.close()
+
+def _get_test_state_file(state_dir: Path, server: str | None = None) -> Path:
+    """Stand-in for matty._get_state_file that keeps state under state_dir."""
+    if server is None:
+        server = "https://test.matrix.org"
+
+    domain = urlparse(server).netloc if server.startswith(("http://", "https://")) else server
+
+    return state_dir / f"{domain}.json"
 
 
 @pytest.fixture(autouse=True)
 def env_setup(monkeypatch, tmp_path):
     """Set up environment variables for tests."""
-    # Use test server configuration
-    monkeypatch.setenv("MATRIX_HOMESERVER", "https://test.matrix.org")
-    monkeypatch.setenv("MATRIX_USERNAME", "test_user")
-    monkeypatch.setenv("MATRIX_PASSWORD", "test_password")
-    monkeypatch.setenv("MATRIX_SSL_VERIFY", "false")
+    for key, value in _TEST_ENV.items():
+        monkeypatch.setenv(key, value)
 
     # Use temporary directory for state files
     test_state_dir = tmp_path / ".config" / "matty" / "state"
     test_state_dir.mkdir(parents=True, exist_ok=True)
-
-    # Patch the state file path to use test directory
-    def _get_test_state_file(server=None):
-        from urllib.parse import urlparse
-
-        if server is None:
-            server = "https://test.matrix.org"
-
-        domain = urlparse(server).netloc if server.startswith(("http://", "https://")) else server
-
-        return test_state_dir / f"{domain}.json"
-
-    monkeypatch.setattr("matty._get_state_file", _get_test_state_file)
+    monkeypatch.setattr("matty._get_state_file", partial(_get_test_state_file, test_state_dir))
 
     # Clear the state for tests
     monkeypatch.setattr("matty._state", None)
 
-    yield
+
+@pytest.fixture(autouse=True)
+def _clear_lru_caches():
+    """Reset matty's memoized helpers so cached results never leak between tests."""
+    for module in (matty.cli, matty.tui):
+        for obj in vars(module).values():
+            if callable(getattr(obj, "cache_clear", None)):
+                obj.cache_clear()
 
 
 @pytest.fixture
@@ -92,15 +103,181 @@ def tui_messages():
 
 @pytest.fixture
 def mock_client():
-    """Create a mock Matrix client."""
-    from unittest.mock import MagicMock
+    """Create a lightweight stand-in for a Matrix client.
+
+    Only plain attributes are provided; tests that need awaitable client
+    methods use the ``async_client`` fixture.
+    """
+    return SimpleNamespace(
+        homeserver="https://test.matrix.org",
+        user_id="@test_user:test.matrix.org",
+        device_id="TEST_DEVICE",
+        rooms={},
+    )
 
-    from nio import AsyncClient
 
-    client = MagicMock(spec=AsyncClient)
-    client.homeserver = "https://test.matrix.org"
-    client.user_id = "@test_user:test.matrix.org"
-    client.device_id = "TEST_DEVICE"
-    client.rooms = {}
+@pytest.fixture(scope="session")
+def runner():
+    """One Typer CliRunner for the session; it holds no per-invocation state."""
+    return CliRunner()
+
 
+@pytest.fixture(scope="session")
+def cli_help(runner):
+    """Render ``matty <command> --help`` once per command for the whole session."""
+
+    @cache
+    def render(*command: str) -> str:
+        result = runner.invoke(matty.cli.app, [*command, "--help"], catch_exceptions=False)
+        assert result.exit_code == 0, result.output
+        return result.output
+
+    return render
+
+
+@pytest.fixture(scope="session")
+def room_send_response():
+    """A successful send response, shared since nio responses are plain values."""
+    return RoomSendResponse(event_id="$event123", room_id="!room:matrix.org")
+
+
+@pytest.fixture(scope="session")
+def login_response():
+    """A successful password login response."""
+    return LoginResponse(user_id="@user:matrix.org", device_id="DEVICE123", access_token="token123")
+
+
+@pytest.fixture
+def fresh_state(monkeypatch):
+    """An empty ServerState installed as matty's cached state."""
+    state = ServerState()
+    monkeypatch.setattr("matty._state", state)
+    return state
+
+
+@pytest.fixture
+def state_file(tmp_path, monkeypatch):
+    """Point matty's state file at a single path under tmp_path, whatever the server.
+
+    Together with ``env_setup`` clearing the cached state, this gives a test an
+    empty state backed by a file it can inspect.
+    """
+    path = tmp_path / "test.json"
+    monkeypatch.setattr("matty._get_state_file", lambda _server=None: path)
+    return path
+
+
+class FakeAsyncClient:
+    """Minimal stand-in for nio.AsyncClient exposing only what matty calls.
+
+    Much cheaper to build than ``MagicMock(spec=AsyncClient)``, which mirrors
+    every attribute of the real class; methods are still mocks for assertions.
+    """
+
+    __slots__ = (
+        "close",
+        "login",
+        "restore_login",
+        "room_messages",
+        "room_redact",
+        "room_resolve_alias",
+        "room_send",
+        "rooms",
+        "sync",
+    )
+
+    def __init__(self) -> None:
+        self.rooms: dict = {}
+        self.close = AsyncMock()
+        self.login = AsyncMock()
+        self.restore_login = MagicMock()
+        self.room_messages = AsyncMock()
+        self.room_redact = AsyncMock()
+        self.room_resolve_alias = AsyncMock()
+        self.room_send = AsyncMock()
+        self.sync = AsyncMock()
+
+
+@pytest.fixture
+def async_client(room_send_response, login_response):
+    """A Matrix client stand-in whose sends and logins succeed."""
+    client = FakeAsyncClient()
+    client.room_send.return_value = room_send_response
+    client.login.return_value = login_response
     return client
+
+
+@dataclass
+class MattyMocks:
+    """Client and helper mocks installed by the ``matty_mocks`` fixture."""
+
+    client: FakeAsyncClient
+    login: AsyncMock
+    sync: AsyncMock
+    find_room: AsyncMock
+
+
+@pytest.fixture
+def matty_mocks(monkeypatch):
+    """Stub client creation, login, sync and room lookup for command tests.
+
+    Tests adjust behaviour through the returned mocks (e.g.
+    ``matty_mocks.login.return_value = False``) instead of nesting patches.
+    """
+    client = FakeAsyncClient()
+    mocks = MattyMocks(
+        client=client,
+        login=AsyncMock(return_value=True),
+        sync=AsyncMock(return_value=None),
+        find_room=AsyncMock(return_value=("!room:matrix.org", "Test Room")),
+    )
+    monkeypatch.setattr("matty._create_client", AsyncMock(return_value=client))
+    monkeypatch.setattr("matty._login", mocks.login)
+    monkeypatch.setattr("matty._sync_client", mocks.sync)
+    monkeypatch.setattr("matty._find_room", mocks.find_room)
+    return mocks
+
+
+@dataclass
+class CliMocks:
+    """Command executors and runner installed by the ``cli_mocks`` fixture."""
+
+    run: MagicMock
+    rooms: MagicMock
+    messages: MagicMock
+    users: MagicMock
+    send: MagicMock
+
+
+@pytest.fixture
+def stub_config(monkeypatch):
+    """Make _load_config return a fixed password-login Config.
+
+    Function-scoped because the command executors overwrite the username and
+    password on the Config they load.
+    """
+    config = Config("https://matrix.org", "user", "pass")
+    monkeypatch.setattr("matty._load_config", lambda: config)
+    return config
+
+
+@pytest.fixture
+def cli_mocks(monkeypatch, stub_config):  # noqa: ARG001
+    """Stub config loading and the async executors behind the Typer commands.
+
+    The executors are plain MagicMocks so invoking a command never creates an
+    un-awaited coroutine; tests assert on the arguments each command passed.
+    """
+    mocks = CliMocks(
+        run=MagicMock(),
+        rooms=MagicMock(),
+        messages=MagicMock(),
+        users=MagicMock(),
+        send=MagicMock(),
+    )
+    monkeypatch.setattr("matty._run_async_command", mocks.run)
+    monkeypatch.setattr("matty._execute_rooms_command", mocks.rooms)
+    monkeypatch.setattr("matty._execute_messages_command", mocks.messages)
+    monkeypatch.setattr("matty._execute_users_command", mocks.users)
+    monkeypatch.setattr("matty._execute_send_command", mocks.send)
+    return mocks
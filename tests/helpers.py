@@ -0,0 +1,25 @@
+"""Shared builders for test data."""
+
+from nio import RoomMessageText
+
+
+def text_event(
+    event_id: str,
+    body: str,
+    server_timestamp: int,
+    *,
+    sender: str = "@user:matrix.org",
+    content: dict | None = None,
+) -> RoomMessageText:
+    """Build a real m.text event; cheaper than a spec'd mock and passes isinstance checks."""
+    return RoomMessageText(
+        source={
+            "event_id": event_id,
+            "sender": sender,
+            "origin_server_ts": server_timestamp,
+            "content": {"body": body, "msgtype": "m.text", **(content or {})},
+        },
+        body=body,
+        format=None,
+        formatted_body=None,
+    )
@@ -1,15 +1,16 @@
 """Fixed tests for matty module to increase code coverage."""
 
-from unittest.mock import AsyncMock, MagicMock
+from types import SimpleNamespace
+from unittest.mock import Mock
 
 import pytest
 from nio import (
     AsyncClient,
+    ErrorResponse,
     LoginResponse,
-    MatrixRoom,
+    RoomResolveAliasResponse,
     RoomSendResponse,
 )
-from typer.testing import CliRunner
 
 from matty import (
     Config,
@@ -24,14 +25,12 @@ from matty import (
     _send_message,
     _sync_client,
 )
-
-runner = CliRunner()
+from tests.helpers import text_event
 
 
 class TestAsyncFunctions:
     """Test async utility functions."""
 
-    @pytest.mark.asyncio
     async def test_create_client(self):
         """Test client creation."""
         config = Config(
@@ -47,52 +46,49 @@ class TestAsyncFunctions:
         finally:
             await client.close()
 
-    @pytest.mark.asyncio
-    async def test_login_success(self):
+    async def test_login_success(self, async_client):
         """Test successful login."""
-        client = MagicMock(spec=AsyncClient)
-        client.login = AsyncMock(
-            return_value=LoginResponse("@user:matrix.org", "device123", "token123")
-        )
+        client = async_client
+        client.login.return_value = LoginResponse("@user:matrix.org", "device123", "token123")
 
         result = await _login(client, "password")
         assert result is True
 
-    @pytest.mark.asyncio
-    async def test_sync_client(self):
+    async def test_sync_client(self, async_client):
         """Test client sync."""
-        client = MagicMock(spec=AsyncClient)
-        sync_response = MagicMock()
-        client.sync = AsyncMock(return_value=sync_response)
+        client = async_client
+        sync_response = Mock()
+        client.sync.return_value = sync_response
 
         await _sync_client(client, timeout=1000)
         client.sync.assert_called_once_with(timeout=1000)
 
-    @pytest.mark.asyncio
-    async def test_get_rooms(self):
+    async def test_get_rooms(self, async_client):
         """Test getting rooms."""
-        client = MagicMock(spec=AsyncClient)
+        client = async_client
 
         # Create mock rooms - users should be a dict, not a list
-        room1 = MagicMock(spec=MatrixRoom)
-        room1.room_id = "!room1:matrix.org"
-        room1.display_name = "Room 1"
-        room1.member_count = 5
-        room1.users = {
-            "@user1:matrix.org": None,
-            "@user2:matrix.org": None,
-            "@user3:matrix.org": None,
-            "@user4:matrix.org": None,
-            "@user5:matrix.org": None,
-        }
-        room1.topic = "Topic 1"
+        room1 = SimpleNamespace(
+            room_id="!room1:matrix.org",
+            display_name="Room 1",
+            member_count=5,
+            users={
+                "@user1:matrix.org": None,
+                "@user2:matrix.org": None,
+                "@user3:matrix.org": None,
+                "@user4:matrix.org": None,
+                "@user5:matrix.org": None,
+            },
+            topic="Topic 1",
+        )
 
-        room2 = MagicMock(spec=MatrixRoom)
-        room2.room_id = "!room2:matrix.org"
-        room2.display_name = "Room 2"
-        room2.member_count = 10
-        room2.users = {f"@user{i}:matrix.org": None for i in range(10)}
-        room2.topic = None
+        room2 = SimpleNamespace(
+            room_id="!room2:matrix.org",
+            display_name="Room 2",
+            member_count=10,
+            users={f"@user{i}:matrix.org": None for i in range(10)},
+            topic=None,
+        )
 
         client.rooms = {"!room1:matrix.org": room1, "!room2:matrix.org": room2}
 
@@ -101,200 +97,139 @@ class TestAsyncFunctions:
         assert rooms[0].name == "Room 1"
         assert rooms[1].member_count == 10
 
-    @pytest.mark.asyncio
-    async def test_find_room(self):
-        """Test finding a room."""
-        client = MagicMock(spec=AsyncClient)
-
-        room = MagicMock(spec=MatrixRoom)
-        room.room_id = "!room1:matrix.org"
-        room.display_name = "Test Room"
-        room.users = {"@user1:matrix.org": None}
-        room.topic = None
-
-        client.rooms = {"!room1:matrix.org": room}
-
-        # Test finding by name
-        result = await _find_room(client, "Test Room")
-        assert result == ("!room1:matrix.org", "Test Room")
-
-        # Test finding by ID
-        result = await _find_room(client, "!room1:matrix.org")
-        assert result == ("!room1:matrix.org", "Test Room")
-
-        # Test not found
-        result = await _find_room(client, "Nonexistent")
-        assert result is None
-
-    @pytest.mark.asyncio
-    async def test_find_room_by_number(self):
-        """Test finding a room by numeric index (matching `matty rooms` output)."""
-        client = MagicMock(spec=AsyncClient)
-
-        room1 = MagicMock(spec=MatrixRoom)
-        room1.room_id = "!room1:matrix.org"
-        room1.display_name = "Alpha"
-        room1.users = {"@user1:matrix.org": None}
-        room1.topic = None
-
-        room2 = MagicMock(spec=MatrixRoom)
-        room2.room_id = "!room2:matrix.org"
-        room2.display_name = "Beta"
-        room2.users = {"@user1:matrix.org": None}
-        room2.topic = None
-
+    @pytest.mark.parametrize(
+        ("rooms", "query", "alias_response", "expected"),
+        [
+            pytest.param(
+                {"!room1:matrix.org": "Test Room"},
+                "Test Room",
+                None,
+                ("!room1:matrix.org", "Test Room"),
+                id="by_name",
+            ),
+            pytest.param(
+                {"!room1:matrix.org": "Test Room"},
+                "!room1:matrix.org",
+                None,
+                ("!room1:matrix.org", "Test Room"),
+                id="by_id",
+            ),
+            pytest.param(
+                {"!room1:matrix.org": "Test Room"}, "Nonexistent", None, None, id="not_found"
+            ),
+            # Numeric index is 1-based, matching `matty rooms` output
+            pytest.param(
+                {"!room1:matrix.org": "Alpha", "!room2:matrix.org": "Beta"},
+                "1",
+                None,
+                ("!room1:matrix.org", "Alpha"),
+                id="by_number_first",
+            ),
+            pytest.param(
+                {"!room1:matrix.org": "Alpha", "!room2:matrix.org": "Beta"},
+                "2",
+                None,
+                ("!room2:matrix.org", "Beta"),
+                id="by_number_second",
+            ),
+            pytest.param(
+                {"!room1:matrix.org": "Alpha", "!room2:matrix.org": "Beta"},
+                "0",
+                None,
+                None,
+                id="by_number_zero",
+            ),
+            pytest.param(
+                {"!room1:matrix.org": "Alpha", "!room2:matrix.org": "Beta"},
+                "3",
+                None,
+                None,
+                id="by_number_out_of_range",
+            ),
+            pytest.param(
+                {"!room1:matrix.org": "Admin Room"},
+                "#admins:matrix.org",
+                RoomResolveAliasResponse("#admins:matrix.org", "!room1:matrix.org", []),
+                ("!room1:matrix.org", "Admin Room"),
+                id="by_alias",
+            ),
+            # Resolved but not joined: the resolved ID comes back with the alias as name
+            pytest.param(
+                {},
+                "#other:matrix.org",
+                RoomResolveAliasResponse("#other:matrix.org", "!room2:matrix.org", []),
+                ("!room2:matrix.org", "#other:matrix.org"),
+                id="by_alias_not_joined",
+            ),
+            # Failed resolution falls back to a display-name match
+            pytest.param(
+                {"!room1:matrix.org": "#admins:matrix.org"},
+                "#admins:matrix.org",
+                ErrorResponse("Not found"),
+                ("!room1:matrix.org", "#admins:matrix.org"),
+                id="by_alias_error",
+            ),
+        ],
+    )
+    async def test_find_room(self, async_client, rooms, query, alias_response, expected):
+        """Test finding a room by name, ID, number, or alias."""
+        client = async_client
         client.rooms = {
-            "!room1:matrix.org": room1,
-            "!room2:matrix.org": room2,
+            room_id: SimpleNamespace(
+                room_id=room_id, display_name=name, users={"@user1:matrix.org": None}, topic=None
+            )
+            for room_id, name in rooms.items()
         }
+        client.room_resolve_alias.return_value = alias_response
 
-        # Test finding by number (1-based index)
-        result = await _find_room(client, "1")
-        assert result == ("!room1:matrix.org", "Alpha")
-
-        result = await _find_room(client, "2")
-        assert result == ("!room2:matrix.org", "Beta")
-
-        # Test out of range
-        result = await _find_room(client, "0")
-        assert result is None
-
-        result = await _find_room(client, "3")
-        assert result is None
-
-    @pytest.mark.asyncio
-    async def test_find_room_by_alias(self):
-        """Test finding a room by alias."""
-        client = MagicMock(spec=AsyncClient)
-
-        # Mock room_resolve_alias response
-        mock_alias_response = MagicMock()
-        mock_alias_response.room_id = "!room1:matrix.org"
-        client.room_resolve_alias = AsyncMock(return_value=mock_alias_response)
-
-        # Mock the room
-        room = MagicMock(spec=MatrixRoom)
-        room.room_id = "!room1:matrix.org"
-        room.display_name = "Admin Room"
-        room.users = {"@admin:matrix.org": None}
-        room.topic = None
-
-        client.rooms = {"!room1:matrix.org": room}
-
-        # Test finding by alias
-        result = await _find_room(client, "#admins:matrix.org")
-        assert result == ("!room1:matrix.org", "Admin Room")
-        client.room_resolve_alias.assert_called_once_with("#admins:matrix.org")
-
-    @pytest.mark.asyncio
-    async def test_find_room_by_alias_not_joined(self):
-        """Test finding a room by alias when not in the room."""
-        client = MagicMock(spec=AsyncClient)
-
-        # Mock room_resolve_alias response
-        mock_alias_response = MagicMock()
-        mock_alias_response.room_id = "!room2:matrix.org"
-        client.room_resolve_alias = AsyncMock(return_value=mock_alias_response)
-
-        # Room is not in our joined rooms
-        client.rooms = {}
-
-        # Test finding by alias - should return the resolved ID and the alias as name
-        result = await _find_room(client, "#other:matrix.org")
-        assert result == ("!room2:matrix.org", "#other:matrix.org")
-        client.room_resolve_alias.assert_called_once_with("#other:matrix.org")
-
-    @pytest.mark.asyncio
-    async def test_find_room_by_alias_error(self):
-        """Test finding a room by alias when resolution fails."""
-        from nio import ErrorResponse
+        result = await _find_room(client, query)
+        assert result == expected
+        if query.startswith("#"):
+            client.room_resolve_alias.assert_called_once_with(query)
+        else:
+            client.room_resolve_alias.assert_not_called()
 
-        client = MagicMock(spec=AsyncClient)
-
-        # Mock room_resolve_alias to return an error
-        client.room_resolve_alias = AsyncMock(return_value=ErrorResponse("Not found"))
-
-        # Mock a room with a similar name to fall back to
-        room = MagicMock(spec=MatrixRoom)
-        room.room_id = "!room1:matrix.org"
-        room.display_name = "#admins:matrix.org"  # Display name matches the alias
-        room.users = {"@admin:matrix.org": None}
-        room.topic = None
-
-        client.rooms = {"!room1:matrix.org": room}
-
-        # Test finding by alias - should fall back to name search
-        result = await _find_room(client, "#admins:matrix.org")
-        assert result == ("!room1:matrix.org", "#admins:matrix.org")
-        client.room_resolve_alias.assert_called_once_with("#admins:matrix.org")
-
-    @pytest.mark.asyncio
-    async def test_get_messages(self):
+    async def test_get_messages(self, async_client):
         """Test getting messages from a room."""
-        from nio import RoomMessageText
-
-        client = MagicMock(spec=AsyncClient)
+        client = async_client
 
-        # Create mock RoomMessageText event
-        mock_event = MagicMock(spec=RoomMessageText)
-        mock_event.sender = "@user:matrix.org"
-        mock_event.body = "Test message"
-        mock_event.server_timestamp = 1704110400000
-        mock_event.event_id = "$event123"
-        mock_event.source = {"content": {"body": "Test message", "msgtype": "m.text"}}
+        # Create a RoomMessageText event
+        mock_event = text_event("$event123", "Test message", 1704110400000)
 
         # Create mock response
-        mock_response = MagicMock()
+        mock_response = Mock()
         mock_response.chunk = [mock_event]
 
-        client.room_messages = AsyncMock(return_value=mock_response)
+        client.room_messages.return_value = mock_response
 
         messages = await _get_messages(client, "!room:matrix.org", limit=10)
         assert len(messages) == 1
         assert messages[0].content == "Test message"
         assert messages[0].sender == "@user:matrix.org"
 
-    @pytest.mark.asyncio
-    async def test_get_messages_with_edit(self):
+    async def test_get_messages_with_edit(self, async_client):
         """Test getting messages with edits."""
-        from nio import RoomMessageText
-
-        client = MagicMock(spec=AsyncClient)
+        client = async_client
 
         # Create original message
-        original_msg = MagicMock(spec=RoomMessageText)
-        original_msg.sender = "@user:matrix.org"
-        original_msg.body = "Original message"
-        original_msg.server_timestamp = 1704110400000
-        original_msg.event_id = "$event123"
-        original_msg.source = {"content": {"body": "Original message", "msgtype": "m.text"}}
+        original_msg = text_event("$event123", "Original message", 1704110400000)
 
         # Create edit event
-        edit_msg = MagicMock(spec=RoomMessageText)
-        edit_msg.sender = "@user:matrix.org"
-        edit_msg.body = "* Edited message"
-        edit_msg.server_timestamp = 1704110500000
-        edit_msg.event_id = "$edit456"
-        edit_msg.source = {
-            "content": {
-                "body": "* Edited message",
-                "msgtype": "m.text",
-                "m.new_content": {
-                    "body": "Edited message",
-                    "msgtype": "m.text",
-                },
-                "m.relates_to": {
-                    "rel_type": "m.replace",
-                    "event_id": "$event123",
-                },
-            }
-        }
+        edit_msg = text_event(
+            "$edit456",
+            "* Edited message",
+            1704110500000,
+            content={
+                "m.new_content": {"body": "Edited message", "msgtype": "m.text"},
+                "m.relates_to": {"rel_type": "m.replace", "event_id": "$event123"},
+            },
+        )
 
         # Create mock response with both messages
-        mock_response = MagicMock()
+        mock_response = Mock()
         mock_response.chunk = [original_msg, edit_msg]
 
-        client.room_messages = AsyncMock(return_value=mock_response)
+        client.room_messages.return_value = mock_response
 
         messages = await _get_messages(client, "!room:matrix.org", limit=10)
         assert len(messages) == 1  # Only the original message should appear
@@ -302,15 +237,14 @@ class TestAsyncFunctions:
         assert "[edited]" in messages[0].content
         assert messages[0].sender == "@user:matrix.org"
 
-    @pytest.mark.asyncio
-    async def test_send_message_reply(self):
+    async def test_send_message_reply(self, async_client):
         """Test sending a reply message."""
-        client = MagicMock(spec=AsyncClient)
+        client = async_client
         response = RoomSendResponse("$new_event123", "!room:matrix.org")
-        client.room_send = AsyncMock(return_value=response)
+        client.room_send.return_value = response
         # Add rooms attribute for mention parsing
         client.rooms = {
-            "!room:matrix.org": MagicMock(users={"@user1:matrix.org": {}, "@user2:matrix.org": {}})
+            "!room:matrix.org": Mock(users={"@user1:matrix.org": {}, "@user2:matrix.org": {}})
         }
 
         result = await _send_message(
@@ -327,15 +261,13 @@ class TestAsyncFunctions:
         assert "m.relates_to" in content
         assert content["m.relates_to"]["m.in_reply_to"]["event_id"] == "$original123"
 
-    @pytest.mark.asyncio
-    async def test_send_message_with_mentions(self):
+    async def test_send_message_with_mentions(self, async_client):
         """Test sending a message with mentions."""
-        client = MagicMock(spec=AsyncClient)
+        client = async_client
         response = RoomSendResponse("$new_event456", "!room:matrix.org")
-        client.room_send = AsyncMock(return_value=response)
+        client.room_send.return_value = response
         # Add rooms attribute with users for mention parsing
-        room_mock = MagicMock()
-        room_mock.users = {"@alice:matrix.org": {}, "@bob:matrix.org": {}}
+        room_mock = SimpleNamespace(users={"@alice:matrix.org": {}, "@bob:matrix.org": {}})
         client.rooms = {"!room:matrix.org": room_mock}
 
         result = await _send_message(
@@ -356,19 +288,19 @@ class TestAsyncFunctions:
         assert "m.mentions" in content
         assert content["m.mentions"]["user_ids"] == ["@alice:matrix.org"]
 
-    @pytest.mark.asyncio
-    async def test_send_message_with_multiple_mentions(self):
+    async def test_send_message_with_multiple_mentions(self, async_client):
         """Test sending a message with multiple mentions."""
-        client = MagicMock(spec=AsyncClient)
+        client = async_client
         response = RoomSendResponse("$new_event789", "!room:matrix.org")
-        client.room_send = AsyncMock(return_value=response)
+        client.room_send.return_value = response
         # Add rooms attribute with users for mention parsing
-        room_mock = MagicMock()
-        room_mock.users = {
-            "@alice:matrix.org": {},
-            "@bob:matrix.org": {},
-            "@charlie:matrix.org": {},
-        }
+        room_mock = SimpleNamespace(
+            users={
+                "@alice:matrix.org": {},
+                "@bob:matrix.org": {},
+                "@charlie:matrix.org": {},
+            }
+        )
         client.rooms = {"!room:matrix.org": room_mock}
 
         result = await _send_message(
@@ -388,15 +320,13 @@ class TestAsyncFunctions:
         }
         assert len(content["m.mentions"]["user_ids"]) == 2
 
-    @pytest.mark.asyncio
-    async def test_send_message_without_mentions(self):
+    async def test_send_message_without_mentions(self, async_client):
         """Test sending a message without mentions."""
-        client = MagicMock(spec=AsyncClient)
+        client = async_client
         response = RoomSendResponse("$new_event999", "!room:matrix.org")
-        client.room_send = AsyncMock(return_value=response)
+        client.room_send.return_value = response
         # Add rooms attribute for mention parsing
-        room_mock = MagicMock()
-        room_mock.users = {"@alice:matrix.org": {}, "@bob:matrix.org": {}}
+        room_mock = SimpleNamespace(users={"@alice:matrix.org": {}, "@bob:matrix.org": {}})
         client.rooms = {"!room:matrix.org": room_mock}
 
         result = await _send_message(
@@ -413,147 +343,78 @@ class TestAsyncFunctions:
         assert content["body"] == "No mentions in this message"
         assert "formatted_body" not in content  # No HTML formatting needed
 
-    @pytest.mark.asyncio
-    async def test_send_message_error(self):
-        """Test message sending error."""
-        client = MagicMock(spec=AsyncClient)
-        # The function catches exceptions and returns False
-        client.room_send = AsyncMock(side_effect=Exception("Send failed"))
-
-        result = await _send_message(client, "!room:matrix.org", "Test")
-        assert result is False
-
-    @pytest.mark.asyncio
-    async def test_get_threads(self):
+    async def test_get_threads(self, async_client):
         """Test getting threads from a room."""
-        from nio import RoomMessageText
-
-        client = MagicMock(spec=AsyncClient)
+        client = async_client
 
         # Create mock events - one thread root, one regular
-        thread_event = MagicMock(spec=RoomMessageText)
-        thread_event.sender = "@user:matrix.org"
-        thread_event.body = "Thread root"
-        thread_event.server_timestamp = 1704110400000
-        thread_event.event_id = "$thread1"
-        thread_event.source = {"content": {"body": "Thread root", "msgtype": "m.text"}}
+        thread_event = text_event("$thread1", "Thread root", 1704110400000)
 
         # Create a reply to make it a thread root
-        reply_event = MagicMock(spec=RoomMessageText)
-        reply_event.sender = "@user:matrix.org"
-        reply_event.body = "Thread reply"
-        reply_event.server_timestamp = 1704110500000
-        reply_event.event_id = "$reply1"
-        reply_event.source = {
-            "content": {
-                "body": "Thread reply",
-                "msgtype": "m.text",
-                "m.relates_to": {"rel_type": "m.thread", "event_id": "$thread1"},
-            }
-        }
+        reply_event = text_event(
+            "$reply1",
+            "Thread reply",
+            1704110500000,
+            content={"m.relates_to": {"rel_type": "m.thread", "event_id": "$thread1"}},
+        )
 
-        regular_event = MagicMock(spec=RoomMessageText)
-        regular_event.sender = "@user:matrix.org"
-        regular_event.body = "Regular message"
-        regular_event.server_timestamp = 1704110600000
-        regular_event.event_id = "$event2"
-        regular_event.source = {"content": {"body": "Regular message", "msgtype": "m.text"}}
+        regular_event = text_event("$event2", "Regular message", 1704110600000)
 
-        mock_response = MagicMock()
+        mock_response = Mock()
         mock_response.chunk = [thread_event, reply_event, regular_event]
 
-        client.room_messages = AsyncMock(return_value=mock_response)
+        client.room_messages.return_value = mock_response
 
         threads = await _get_threads(client, "!room:matrix.org")
         assert len(threads) == 1
         assert threads[0].event_id == "$thread1"
 
-    @pytest.mark.asyncio
-    async def test_get_thread_messages(self):
+    async def test_get_thread_messages(self, async_client):
         """Test getting messages in a thread."""
-        from nio import RoomMessageText
-
-        client = MagicMock(spec=AsyncClient)
+        client = async_client
 
         # Create mock events
-        thread_root = MagicMock(spec=RoomMessageText)
-        thread_root.sender = "@user:matrix.org"
-        thread_root.body = "Thread root"
-        thread_root.server_timestamp = 1704110400000
-        thread_root.event_id = "$thread1"
-        thread_root.source = {
-            "content": {
-                "body": "Thread root",
-                "msgtype": "m.text",
-            }
-        }
+        thread_root = text_event("$thread1", "Thread root", 1704110400000)
 
-        thread_reply = MagicMock(spec=RoomMessageText)
-        thread_reply.sender = "@user:matrix.org"
-        thread_reply.body = "Thread reply"
-        thread_reply.server_timestamp = 1704110500000
-        thread_reply.event_id = "$reply1"
-        thread_reply.source = {
-            "content": {
-                "body": "Thread reply",
-                "msgtype": "m.text",
-                "m.relates_to": {
-                    "rel_type": "m.thread",
-                    "event_id": "$thread1",
-                },
-            }
-        }
+        thread_reply = text_event(
+            "$reply1",
+            "Thread reply",
+            1704110500000,
+            content={"m.relates_to": {"rel_type": "m.thread", "event_id": "$thread1"}},
+        )
 
-        other_msg = MagicMock(spec=RoomMessageText)
-        other_msg.sender = "@user:matrix.org"
-        other_msg.body = "Other message"
-        other_msg.server_timestamp = 1704110600000
-        other_msg.event_id = "$other"
-        other_msg.source = {"content": {"body": "Other message", "msgtype": "m.text"}}
+        other_msg = text_event("$other", "Other message", 1704110600000)
 
         # Mock the room_messages response
-        mock_response = MagicMock()
+        mock_response = Mock()
         mock_response.chunk = [thread_root, thread_reply, other_msg]
 
-        client.room_messages = AsyncMock(return_value=mock_response)
+        client.room_messages.return_value = mock_response
 
         thread_messages = await _get_thread_messages(client, "!room:matrix.org", "$thread1")
         assert len(thread_messages) == 2
         assert thread_messages[0].event_id == "$thread1"
         assert thread_messages[1].event_id == "$reply1"
 
-    @pytest.mark.asyncio
-    async def test_get_message_by_handle(self):
+    async def test_get_message_by_handle(self, async_client):
         """Test getting message by handle."""
-        from nio import RoomMessageText
-
-        client = MagicMock(spec=AsyncClient)
+        client = async_client
 
         # Create mock events
-        msg1 = MagicMock(spec=RoomMessageText)
-        msg1.sender = "@user:matrix.org"
-        msg1.body = "Message 1"
-        msg1.server_timestamp = 1704110400000
-        msg1.event_id = "$event1"
-        msg1.source = {"content": {"body": "Message 1", "msgtype": "m.text"}}
-
-        msg2 = MagicMock(spec=RoomMessageText)
-        msg2.sender = "@user:matrix.org"
-        msg2.body = "Message 2"
-        msg2.server_timestamp = 1704110500000
-        msg2.event_id = "$event2"
-        msg2.source = {"content": {"body": "Message 2", "msgtype": "m.text"}}
+        msg1 = text_event("$event1", "Message 1", 1704110400000)
+
+        msg2 = text_event("$event2", "Message 2", 1704110500000)
 
         # Mock the room_messages response
         # Note: _get_messages reverses the order, so msg2 then msg1 in the response
         # will become msg1 then msg2 after reversal
-        mock_response = MagicMock()
+        mock_response = Mock()
         mock_response.chunk = [
             msg2,
             msg1,
         ]  # Reversed order because _get_messages reverses
 
-        client.room_messages = AsyncMock(return_value=mock_response)
+        client.room_messages.return_value = mock_response
 
         # Test with m2 format
         msg = await _get_message_by_handle(client, "!room:matrix.org", "m2")
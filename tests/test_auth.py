@@ -12,7 +12,6 @@ from unittest.mock import AsyncMock, MagicMock
 import httpx
 import pytest
 from nio import LoginResponse
-from typer.testing import CliRunner
 
 from matty import Config
 from matty.auth import (
@@ -32,8 +31,7 @@ from matty.cli import _authenticate_client, _load_config, app
 if TYPE_CHECKING:
     from pathlib import Path
 
-
-runner = CliRunner()
+    from typer.testing import CliRunner
 
 
 def _clear_matrix_env(monkeypatch: pytest.MonkeyPatch) -> None:
@@ -49,20 +47,19 @@ def _clear_matrix_env(monkeypatch: pytest.MonkeyPatch) -> None:
         monkeypatch.delenv(name, raising=False)
 
 
-def test_auth_help_lists_all_auth_modes() -> None:
-    result = runner.invoke(app, ["auth", "--help"])
+def test_auth_help_lists_all_auth_modes(cli_help) -> None:
+    output = cli_help("auth")
 
-    assert result.exit_code == 0
-    assert "token" in result.output
-    assert "password" in result.output
-    assert "sso-url" in result.output
-    assert "providers" in result.output
-    assert "sso" in result.output
-    assert "login-token" in result.output
-    assert "logout" in result.output
+    assert "token" in output
+    assert "password" in output
+    assert "sso-url" in output
+    assert "providers" in output
+    assert "sso" in output
+    assert "login-token" in output
+    assert "logout" in output
 
 
-def test_auth_token_writes_stored_access_token_config(tmp_path: Path) -> None:
+def test_auth_token_writes_stored_access_token_config(runner: CliRunner, tmp_path: Path) -> None:
     config_path = tmp_path / "config.json"
 
     result = runner.invoke(
@@ -89,7 +86,7 @@ def test_auth_token_writes_stored_access_token_config(tmp_path: Path) -> None:
     assert "password" not in saved
 
 
-def test_auth_logout_removes_stored_config(tmp_path: Path) -> None:
+def test_auth_logout_removes_stored_config(runner: CliRunner, tmp_path: Path) -> None:
     config_path = tmp_path / "config.json"
     config_path.write_text('{"homeserver": "https://matrix.example.com"}\n', encoding="utf-8")
 
@@ -100,7 +97,7 @@ def test_auth_logout_removes_stored_config(tmp_path: Path) -> None:
     assert "Removed Matty credentials" in result.output
 
 
-def test_auth_logout_is_idempotent(tmp_path: Path) -> None:
+def test_auth_logout_is_idempotent(runner: CliRunner, tmp_path: Path) -> None:
     config_path = tmp_path / "missing.json"
 
     result = runner.invoke(app, ["auth", "logout", "--config", str(config_path)])
@@ -109,14 +106,14 @@ def test_auth_logout_is_idempotent(tmp_path: Path) -> None:
     assert "No Matty credentials found" in result.output
 
 
-def test_config_path_prints_default_path() -> None:
+def test_config_path_prints_default_path(runner: CliRunner) -> None:
     result = runner.invoke(app, ["config-path"])
 
     assert result.exit_code == 0
     assert result.output.strip().endswith(".config/matty/config.json")
 
 
-def test_auth_sso_url_opens_browser(monkeypatch: pytest.MonkeyPatch) -> None:
+def test_auth_sso_url_opens_browser(runner: CliRunner, monkeypatch: pytest.MonkeyPatch) -> None:
     opened: list[str] = []
     monkeypatch.setattr("matty.cli.webbrowser.open", opened.append)
     monkeypatch.setattr(
@@ -145,7 +142,9 @@ def test_auth_sso_url_opens_browser(monkeypatch: pytest.MonkeyPatch) -> None:
     assert opened == [result.output.strip()]
 
 
-def test_auth_providers_lists_provider_ids(monkeypatch: pytest.MonkeyPatch) -> None:
+def test_auth_providers_lists_provider_ids(
+    runner: CliRunner, monkeypatch: pytest.MonkeyPatch
+) -> None:
     def fake_fetch_sso_providers(*, homeserver: str, ssl_verify: bool = True) -> list[SSOProvider]:
         assert homeserver == "https://matrix.example.com"
         assert ssl_verify is False
@@ -166,7 +165,9 @@ def test_auth_providers_lists_provider_ids(monkeypatch: pytest.MonkeyPatch) -> N
     assert "github\tGitHub" in result.output
 
 
-def test_auth_providers_reports_empty_list(monkeypatch: pytest.MonkeyPatch) -> None:
+def test_auth_providers_reports_empty_list(
+    runner: CliRunner, monkeypatch: pytest.MonkeyPatch
+) -> None:
     monkeypatch.setattr("matty.cli.fetch_sso_providers", lambda **_kwargs: [])
 
     result = runner.invoke(app, ["auth", "providers", "https://matrix.example.com"])
@@ -175,7 +176,9 @@ def test_auth_providers_reports_empty_list(monkeypatch: pytest.MonkeyPatch) -> N
     assert "No Matrix SSO providers" in result.output
 
 
-def test_auth_password_saves_login_result(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+def test_auth_password_saves_login_result(
+    runner: CliRunner, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
     config_path = tmp_path / "config.json"
 
     async def fake_login_with_password(**kwargs) -> LoginResult:
@@ -218,7 +221,7 @@ def test_auth_password_saves_login_result(monkeypatch: pytest.MonkeyPatch, tmp_p
 
 
 def test_auth_login_token_saves_login_result(
-    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    runner: CliRunner, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
 ) -> None:
     config_path = tmp_path / "config.json"
 
@@ -251,7 +254,7 @@ def test_auth_login_token_saves_login_result(
 
 
 def test_auth_sso_waits_for_callback_and_saves_result(
-    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    runner: CliRunner, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
 ) -> None:
     config_path = tmp_path / "config.json"
     closed: list[bool] = []
@@ -297,7 +300,7 @@ def test_auth_sso_waits_for_callback_and_saves_result(
 
 
 def test_auth_sso_resolves_provider_name_to_advertised_id(
-    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    runner: CliRunner, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
 ) -> None:
     config_path = tmp_path / "config.json"
     opened: list[str] = []
@@ -356,6 +359,7 @@ def test_auth_sso_resolves_provider_name_to_advertised_id(
 
 
 def test_auth_sso_rejects_unknown_advertised_provider(
+    runner: CliRunner,
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
     monkeypatch.setattr(
@@ -577,7 +581,6 @@ def test_sso_callback_server_reports_missing_login_token() -> None:
         thread.join(timeout=10)
 
 
-@pytest.mark.asyncio
 async def test_login_with_password_returns_login_result(monkeypatch: pytest.MonkeyPatch) -> None:
     client = AsyncMock()
     client.login.return_value = LoginResponse("@alice:example.com", "TESTDEVICE", "test-token")
@@ -608,7 +611,6 @@ async def test_login_with_password_returns_login_result(monkeypatch: pytest.Monk
     client.close.assert_awaited_once()
 
 
-@pytest.mark.asyncio
 async def test_login_with_password_reports_login_error(monkeypatch: pytest.MonkeyPatch) -> None:
     client = AsyncMock()
     client.login.return_value = object()
@@ -628,7 +630,6 @@ async def test_login_with_password_reports_login_error(monkeypatch: pytest.Monke
     client.close.assert_awaited_once()
 
 
-@pytest.mark.asyncio
 async def test_login_with_token_fetches_user_id_when_login_response_omits_it() -> None:
     requests: list[tuple[str, str]] = []
 
@@ -666,7 +667,6 @@ async def test_login_with_token_fetches_user_id_when_login_response_omits_it() -
     ]
 
 
-@pytest.mark.asyncio
 async def test_login_with_token_uses_user_id_from_login_response() -> None:
     def handler(request: httpx.Request) -> httpx.Response:
         assert request.url.path == "/_matrix/client/v3/login"
@@ -690,7 +690,6 @@ async def test_login_with_token_uses_user_id_from_login_response() -> None:
     assert result.device_id == "TESTDEVICE"
 
 
-@pytest.mark.asyncio
 async def test_login_with_token_reports_redirected_matrix_api() -> None:
     async with httpx.AsyncClient(
         transport=httpx.MockTransport(
@@ -707,7 +706,6 @@ async def test_login_with_token_reports_redirected_matrix_api() -> None:
             )
 
 
-@pytest.mark.asyncio
 async def test_login_with_token_requires_access_token() -> None:
     async with httpx.AsyncClient(
         transport=httpx.MockTransport(lambda _request: httpx.Response(200, json={}))
@@ -720,7 +718,6 @@ async def test_login_with_token_requires_access_token() -> None:
             )
 
 
-@pytest.mark.asyncio
 async def test_login_with_token_requires_json_object() -> None:
     async with httpx.AsyncClient(
         transport=httpx.MockTransport(lambda _request: httpx.Response(200, json=[]))
@@ -3,14 +3,11 @@
 from unittest.mock import MagicMock, patch
 
 import pytest
-from typer.testing import CliRunner
 
 from matty import (
     _validate_required_args,
 )
 
-runner = CliRunner()
-
 
 class TestCLIValidation:
     """Test CLI argument validation."""
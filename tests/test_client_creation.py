@@ -2,21 +2,15 @@
 
 from unittest.mock import patch
 
-import pytest
-from typer.testing import CliRunner
-
 from matty import (
     Config,
     _create_client,
 )
 
-runner = CliRunner()
-
 
 class TestClientCreation:
     """Test Matrix client creation."""
 
-    @pytest.mark.asyncio
     async def test_create_client_with_ssl_verify(self):
         """Test creating client with SSL verification enabled."""
         config = Config(
@@ -33,7 +27,6 @@ class TestClientCreation:
             assert call_args[0][1] == "mindroom_user"
             assert call_args[1]["ssl"] is True
 
-    @pytest.mark.asyncio
     async def test_create_client_without_ssl_verify(self):
         """Test creating client with SSL verification disabled."""
         config = Config(
@@ -1,14 +1,16 @@
 """Additional tests to improve coverage to >90%."""
 
-from unittest.mock import patch
-
-from typer.testing import CliRunner
+import pytest
 
 from matty import (
     _load_config,
 )
 
-runner = CliRunner()
+
+@pytest.fixture(autouse=True)
+def _skip_dotenv(monkeypatch):
+    """Keep _load_config from searching for and reading a .env file."""
+    monkeypatch.setattr("matty.load_dotenv", lambda *_args, **_kwargs: False)
 
 
 class TestConfigLoading:
@@ -39,17 +41,21 @@ class TestConfigLoading:
         monkeypatch.delenv("MATRIX_DEVICE_ID", raising=False)
         monkeypatch.delenv("MATRIX_ACCESS_TOKEN", raising=False)
 
-        # Mock dotenv.load_dotenv to not load .env file
-        with patch("matty.load_dotenv"):
-            config = _load_config(tmp_path / "missing-config.json")
-            assert config.homeserver == "https://matrix.org"
-            assert config.username is None
-            assert config.password is None
-            assert config.ssl_verify is True
-
-    def test_load_config_ssl_verify_false(self, monkeypatch):
-        """Test loading config with SSL verify disabled."""
-        monkeypatch.setenv("MATRIX_SSL_VERIFY", "false")
-
-        config = _load_config()
-        assert config.ssl_verify is False
+        config = _load_config(tmp_path / "missing-config.json")
+        assert config.homeserver == "https://matrix.org"
+        assert config.username is None
+        assert config.password is None
+        assert config.ssl_verify is True
+
+    @pytest.mark.parametrize(
+        ("ssl_env", "expected"), [("false", False), ("true", True), (None, True)]
+    )
+    def test_load_config_ssl_verify(self, monkeypatch, tmp_path, ssl_env, expected):
+        """MATRIX_SSL_VERIFY only disables verification when set to "false"."""
+        if ssl_env is None:
+            monkeypatch.delenv("MATRIX_SSL_VERIFY", raising=False)
+        else:
+            monkeypatch.setenv("MATRIX_SSL_VERIFY", ssl_env)
+
+        config = _load_config(tmp_path / "missing-config.json")
+        assert config.ssl_verify is expected
@@ -3,16 +3,13 @@
 from datetime import UTC, datetime
 from unittest.mock import patch
 
-from typer.testing import CliRunner
-
 from matty import (
+    Config,
     Message,
     Room,
     _load_config,
 )
 
-runner = CliRunner()
-
 
 class TestDataclasses:
     """Test dataclass functionality."""
@@ -41,7 +38,7 @@ class TestDataclasses:
         msg = Message(
             sender="@user:matrix.org",
             content="Thread message",
-            timestamp=datetime.now(UTC),
+            timestamp=datetime(2024, 1, 1, tzinfo=UTC),
             room_id="!room:matrix.org",
             event_id="$event123",
             thread_root_id="$thread123",
@@ -51,6 +48,19 @@ class TestDataclasses:
         assert msg.reply_to_id == "$reply123"
         assert msg.is_thread_root is False
 
+    def test_data_models_use_slots(self):
+        """Test hot data models are slotted (no per-instance __dict__)."""
+        msg = Message(
+            sender="@user:matrix.org",
+            content="hi",
+            timestamp=datetime(2024, 1, 1, tzinfo=UTC),
+            room_id="!room:matrix.org",
+        )
+        room = Room(room_id="!test:matrix.org", name="Test", member_count=0)
+        assert not hasattr(msg, "__dict__")
+        assert not hasattr(room, "__dict__")
+        assert not hasattr(Config(), "__dict__")
+
     def test_config_from_env(self):
         """Test Config loading from environment variables."""
         with patch.dict(
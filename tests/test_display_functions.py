@@ -1,9 +1,12 @@
 """Additional tests to improve coverage to >90%."""
 
+import io
 import json
 from datetime import UTC, datetime
+from unittest.mock import patch
 
-from typer.testing import CliRunner
+import pytest
+from rich.console import Console
 
 from matty import (
     Message,
@@ -17,130 +20,161 @@ from matty import (
     _display_users_json,
     _display_users_rich,
     _display_users_simple,
+    _format_timestamp,
 )
 
-runner = CliRunner()
+# Inputs shared by every output format; the display functions only read them
+_ROOMS = [
+    Room(room_id="!room1:matrix.org", name="Room 1", member_count=5, topic="Topic 1"),
+    Room(room_id="!room2:matrix.org", name="Room 2", member_count=10, topic=None),
+]
+_MESSAGES = [
+    Message(
+        sender="@user:matrix.org",
+        content="Hello world",
+        timestamp=datetime(2024, 1, 1, 10, 0, 0, tzinfo=UTC),
+        room_id="!room:matrix.org",
+        event_id="$msg1",
+        handle="m1",
+        thread_handle="t1",
+        reactions={"👍": ["@other:matrix.org"]},
+    )
+]
+_USERS = ["@alice:matrix.org", "@bob:matrix.org"]
+
+
+def _contains(*snippets):
+    """Check that every snippet appears in the captured output."""
+    return lambda out: all(snippet in out for snippet in snippets)
 
 
 class TestDisplayFunctions:
     """Test various display output functions."""
 
-    def test_display_rooms_rich(self, capsys):
-        """Test rich display of rooms."""
-        rooms = [
-            Room(room_id="!room1:matrix.org", name="Room 1", member_count=5, topic="Topic 1"),
-            Room(room_id="!room2:matrix.org", name="Room 2", member_count=10, topic=None),
-        ]
-        _display_rooms_rich(rooms)
-        captured = capsys.readouterr()
-        # Rich output includes table formatting
-        assert captured.out != ""
-
-    def test_display_rooms_simple(self, capsys):
-        """Test simple display of rooms."""
-        rooms = [
-            Room(room_id="!room1:matrix.org", name="Room 1", member_count=5, topic="Topic 1"),
-            Room(room_id="!room2:matrix.org", name="Room 2", member_count=10, topic=None),
-        ]
-        _display_rooms_simple(rooms)
-        captured = capsys.readouterr()
-        assert "Room 1" in captured.out
-        assert "Room 2" in captured.out
-        assert "5 members" in captured.out
-        assert "10 members" in captured.out
-
-    def test_display_rooms_json(self, capsys):
-        """Test JSON display of rooms."""
-        rooms = [
-            Room(room_id="!room1:matrix.org", name="Room 1", member_count=5, topic="Topic 1"),
-        ]
-        _display_rooms_json(rooms)
-        captured = capsys.readouterr()
-        data = json.loads(captured.out)
-        assert len(data) == 1
-        assert data[0]["name"] == "Room 1"
-        assert data[0]["member_count"] == 5
-
-    def test_display_messages_rich(self, capsys):
-        """Test rich display of messages."""
+    def test_format_timestamp_matches_strftime(self):
+        """Test the fast HH:MM formatter agrees with strftime."""
+        for ts in (
+            datetime(2024, 1, 1, 0, 0, tzinfo=UTC),
+            datetime(2024, 1, 1, 9, 5, tzinfo=UTC),
+            datetime(2024, 1, 1, 23, 59, 59, tzinfo=UTC),
+        ):
+            assert _format_timestamp(ts) == ts.strftime("%H:%M")
+
+    @pytest.mark.parametrize(
+        ("display", "check"),
+        [
+            # Rich output is table formatting, so only check something was printed
+            pytest.param(_display_rooms_rich, bool, id="rich"),
+            pytest.param(
+                _display_rooms_simple,
+                _contains("Room 1", "Room 2", "5 members", "10 members"),
+                id="simple",
+            ),
+            pytest.param(
+                _display_rooms_json,
+                lambda out: [(r["name"], r["member_count"]) for r in json.loads(out)]
+                == [("Room 1", 5), ("Room 2", 10)],
+                id="json",
+            ),
+        ],
+    )
+    def test_display_rooms(self, capsys, display, check):
+        """Each rooms output format renders the room list."""
+        display(_ROOMS)
+        assert check(capsys.readouterr().out)
+
+    @pytest.mark.parametrize(
+        ("display", "check"),
+        [
+            pytest.param(_display_messages_rich, bool, id="rich"),
+            pytest.param(
+                _display_messages_simple,
+                _contains(
+                    "Test Room", "@user:matrix.org", "Hello world", "m1", "IN-THREAD t1", "👍"
+                ),
+                id="simple",
+            ),
+            pytest.param(
+                _display_messages_json,
+                lambda out: (data := json.loads(out))["room"] == "Test Room"
+                and [m["content"] for m in data["messages"]] == ["Hello world"],
+                id="json",
+            ),
+        ],
+    )
+    def test_display_messages(self, capsys, display, check):
+        """Each messages output format renders the room's messages."""
+        display(_MESSAGES, "Test Room")
+        assert check(capsys.readouterr().out)
+
+    def test_display_messages_rich_prints_body_once(self):
+        """All message and reaction lines should go out in a single console.print."""
         messages = [
             Message(
                 sender="@user:matrix.org",
-                content="Hello world",
-                timestamp=datetime(2024, 1, 1, 10, 0, 0, tzinfo=UTC),
+                content=f"Hello {i}",
+                timestamp=datetime(2024, 1, 1, 10, i, 0, tzinfo=UTC),
                 room_id="!room:matrix.org",
-                event_id="$msg1",
-                handle="m1",
+                event_id=f"$msg{i}",
+                handle=f"m{i}",
+                reactions={"👍": ["@bob:matrix.org"]},
             )
+            for i in range(3)
         ]
-        _display_messages_rich(messages, "Test Room")
-        captured = capsys.readouterr()
-        assert captured.out != ""
+        with patch("matty.console.print") as mock_print:
+            _display_messages_rich(messages, "Test Room")
+
+        # One call for the room panel, one for every message line
+        assert mock_print.call_count == 2
+        body = mock_print.call_args_list[1].args[0]
+        assert body.count("Reactions:") == 3
+        assert "Hello 2" in body
 
-    def test_display_messages_simple(self, capsys):
-        """Test simple display of messages."""
+    def test_display_messages_rich_contains_unclosed_markup(self, monkeypatch):
+        """Markup-like text and reaction keys are printed literally and style nothing after."""
+        console = Console(
+            file=io.StringIO(), force_terminal=True, color_system="standard", highlight=False
+        )
+        monkeypatch.setattr("matty.console", console)
         messages = [
             Message(
                 sender="@user:matrix.org",
-                content="Hello world",
+                content=content,
                 timestamp=datetime(2024, 1, 1, 10, 0, 0, tzinfo=UTC),
                 room_id="!room:matrix.org",
-                event_id="$msg1",
-                handle="m1",
-                thread_handle="t1",  # Use thread_handle instead of thread_root_id
-                reactions={"👍": ["@other:matrix.org"]},
+                event_id=f"$msg{i}",
+                handle=f"m{i}",
+                reactions=reactions,
             )
-        ]
-        _display_messages_simple(messages, "Test Room")
-        captured = capsys.readouterr()
-        assert "Test Room" in captured.out
-        assert "@user:matrix.org" in captured.out
-        assert "Hello world" in captured.out
-        assert "m1" in captured.out
-        assert "IN-THREAD t1" in captured.out  # Check for actual thread marker format
-        assert "👍" in captured.out  # Reaction
-
-    def test_display_messages_json(self, capsys):
-        """Test JSON display of messages."""
-        messages = [
-            Message(
-                sender="@user:matrix.org",
-                content="Test message",
-                timestamp=datetime(2024, 1, 1, 10, 0, 0, tzinfo=UTC),
-                room_id="!room:matrix.org",
-                event_id="$msg1",
-                handle="m1",
+            for i, (content, reactions) in enumerate(
+                [("[red]alert", {}), ("hello", {"[red]": ["@bob:matrix.org"]}), ("all calm", {})]
             )
         ]
-        _display_messages_json(messages, "Test Room")
-        captured = capsys.readouterr()
-        data = json.loads(captured.out)
-        assert data["room"] == "Test Room"
-        assert len(data["messages"]) == 1
-        assert data["messages"][0]["content"] == "Test message"
-
-    def test_display_users_rich(self, capsys):
-        """Test rich display of users."""
-        users = ["@alice:matrix.org", "@bob:matrix.org", "@charlie:matrix.org"]
-        _display_users_rich(users, "Test Room")
-        captured = capsys.readouterr()
-        assert captured.out != ""
-
-    def test_display_users_simple(self, capsys):
-        """Test simple display of users."""
-        users = ["@alice:matrix.org", "@bob:matrix.org"]
-        _display_users_simple(users, "Test Room")
-        captured = capsys.readouterr()
-        assert "Test Room" in captured.out
-        assert "@alice:matrix.org" in captured.out
-        assert "@bob:matrix.org" in captured.out
-
-    def test_display_users_json(self, capsys):
-        """Test JSON display of users."""
-        users = ["@alice:matrix.org", "@bob:matrix.org"]
-        _display_users_json(users, "Test Room")
-        captured = capsys.readouterr()
-        data = json.loads(captured.out)
-        assert data["room"] == "Test Room"
-        assert len(data["users"]) == 2
-        assert "@alice:matrix.org" in data["users"]
+
+        _display_messages_rich(messages, "Test Room")
+
+        out = console.file.getvalue()
+        assert "[red]alert" in out
+        assert "[red] 1" in out
+        assert "\x1b[31m" not in out  # red foreground
+
+    @pytest.mark.parametrize(
+        ("display", "check"),
+        [
+            pytest.param(_display_users_rich, bool, id="rich"),
+            pytest.param(
+                _display_users_simple,
+                _contains("Test Room", "@alice:matrix.org", "@bob:matrix.org"),
+                id="simple",
+            ),
+            pytest.param(
+                _display_users_json,
+                lambda out: json.loads(out) == {"room": "Test Room", "users": _USERS},
+                id="json",
+            ),
+        ],
+    )
+    def test_display_users(self, capsys, display, check):
+        """Each users output format renders the member list."""
+        display(_USERS, "Test Room")
+        assert check(capsys.readouterr().out)
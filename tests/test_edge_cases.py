@@ -1,273 +1,147 @@
 """Additional tests to reach >90% coverage."""
 
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
-from nio import AsyncClient, LoginResponse, RoomSendResponse
+from nio import ErrorResponse, RoomSendResponse
 
 from matty import (
-    OutputFormat,
-    ServerState,
-    _execute_messages_command,
     _execute_send_command,
     _get_messages,
     _get_relation,
     _get_threads,
     _is_relation_type,
-    _load_state,
     _login,
     _parse_mentions,
-    _save_state,
     _send_message,
 )
+from tests.helpers import text_event
 
+# Read-only timeline events shared by the fetch tests
+_MSG = text_event("$msg123", "Test message", 1704110400000)
 
-class TestEdgeCases:
-    """Test edge cases and error conditions."""
-
-    @pytest.mark.asyncio
-    async def test_login_success_response(self):
-        """Test successful login response."""
-        client = MagicMock(spec=AsyncClient)
-        response = LoginResponse(
-            user_id="@user:matrix.org", device_id="DEVICE123", access_token="token123"
-        )
-        client.login = AsyncMock(return_value=response)
-
-        result = await _login(client, "password")
-        assert result is True
-
-    @pytest.mark.asyncio
-    async def test_send_message_success(self):
-        """Test successful message send."""
-        client = MagicMock(spec=AsyncClient)
-        # Mock the rooms attribute
-        client.rooms = {}
-        response = RoomSendResponse(event_id="$event123", room_id="!room:matrix.org")
-        client.room_send = AsyncMock(return_value=response)
-
-        result = await _send_message(client, "!room:matrix.org", "Test")
-        assert result is True
-
-    @pytest.mark.asyncio
-    async def test_send_message_with_thread(self):
-        """Test sending message in thread."""
-        client = MagicMock(spec=AsyncClient)
-        # Mock the rooms attribute
-        client.rooms = {}
-        response = RoomSendResponse(event_id="$event456", room_id="!room:matrix.org")
-        client.room_send = AsyncMock(return_value=response)
+# Room members for the mention tests; a tuple because matching is first-in-room-order
+_USERS = ("@alice:matrix.org", "@bob:matrix.org")
 
-        result = await _send_message(
-            client, "!room:matrix.org", "Thread reply", thread_root_id="$thread123"
-        )
-        assert result is True
+_THREAD_ROOT = text_event(
+    "$thread123",
+    "Thread start",
+    1704110400000,
+    content={"m.relates_to": {"rel_type": "m.thread", "event_id": "$thread123"}},
+)
 
-        # Verify thread relation was included
-        call_args = client.room_send.call_args
-        content = call_args[1]["content"]
-        assert "m.relates_to" in content
-        assert content["m.relates_to"]["event_id"] == "$thread123"
 
-    @pytest.mark.asyncio
-    async def test_send_message_with_reply(self):
-        """Test sending reply message."""
-        client = MagicMock(spec=AsyncClient)
-        # Mock the rooms attribute
-        client.rooms = {}
-        response = RoomSendResponse(event_id="$event789", room_id="!room:matrix.org")
-        client.room_send = AsyncMock(return_value=response)
+class TestEdgeCases:
+    """Test edge cases and error conditions."""
 
-        result = await _send_message(
-            client, "!room:matrix.org", "Reply text", reply_to_id="$original123"
-        )
+    async def test_login_success_response(self, async_client):
+        """Test successful login response."""
+        result = await _login(async_client, "password")
         assert result is True
 
-        # Verify reply relation was included
-        call_args = client.room_send.call_args
-        content = call_args[1]["content"]
-        assert "m.relates_to" in content
-        assert "m.in_reply_to" in content["m.relates_to"]
-
-    @pytest.mark.asyncio
-    async def test_send_message_with_error(self):
-        """Test sending message with error."""
-        client = MagicMock(spec=AsyncClient)
-        # Mock the rooms attribute
-        client.rooms = {}
-        # Return error response
-        client.room_send = AsyncMock(side_effect=Exception("Network error"))
-
-        result = await _send_message(client, "!room:matrix.org", "Test message")
-        assert result is False
-
-    @pytest.mark.asyncio
-    async def test_send_message_with_mentions(self):
-        """Test sending message with mentions."""
-        client = MagicMock(spec=AsyncClient)
-        # Mock the rooms attribute with a room that has users
+    @pytest.mark.parametrize(
+        ("text", "kwargs", "check"),
+        [
+            pytest.param("Plain text", {}, lambda c: c["body"] == "Plain text", id="plain"),
+            pytest.param(
+                "Thread reply",
+                {"thread_root_id": "$thread123"},
+                lambda c: c["m.relates_to"]["event_id"] == "$thread123",
+                id="thread",
+            ),
+            pytest.param(
+                "Reply text",
+                {"reply_to_id": "$original123"},
+                lambda c: "m.in_reply_to" in c["m.relates_to"],
+                id="reply",
+            ),
+            pytest.param(
+                "Hello @user",
+                {},
+                lambda c: "@user:matrix.org" in c["m.mentions"]["user_ids"],
+                id="mentions",
+            ),
+        ],
+    )
+    async def test_send_message_content(self, async_client, text, kwargs, check):
+        """Test the event content built for plain, thread, reply and mention sends."""
         mock_room = MagicMock()
         mock_room.users = {"@user:matrix.org": None, "@alice:matrix.org": None}
-        client.rooms = {"!room:matrix.org": mock_room}
-        response = RoomSendResponse(event_id="$mention123", room_id="!room:matrix.org")
-        client.room_send = AsyncMock(return_value=response)
+        async_client.rooms = {"!room:matrix.org": mock_room}
 
-        result = await _send_message(client, "!room:matrix.org", "Hello @user")
-        assert result is True
-
-        # Verify mentions were included (parsed from message text)
-        call_args = client.room_send.call_args
-        content = call_args[1]["content"]
-        # Message with @user should have been parsed to include mentions
-        assert "m.mentions" in content
-        assert "@user:matrix.org" in content["m.mentions"]["user_ids"]
+        result = await _send_message(async_client, "!room:matrix.org", text, **kwargs)
 
-    @pytest.mark.asyncio
-    async def test_get_messages_success(self):
+        assert result is True
+        assert check(async_client.room_send.call_args.kwargs["content"])
+
+    @pytest.mark.parametrize(
+        ("response", "expected"),
+        [
+            pytest.param(RoomSendResponse("$new123", "!room:matrix.org"), True, id="sent"),
+            pytest.param(ErrorResponse("bad request"), False, id="error_response"),
+            pytest.param(Exception("Network error"), False, id="exception"),
+        ],
+    )
+    async def test_send_message_outcome(self, async_client, response, expected):
+        """_send_message reports success only for a successful send response."""
+        if isinstance(response, Exception):
+            async_client.room_send.side_effect = response
+        else:
+            async_client.room_send.return_value = response
+
+        result = await _send_message(async_client, "!room:matrix.org", "Test message")
+        assert result is expected
+
+    async def test_get_messages_success(self, async_client):
         """Test getting messages successfully."""
-        from nio import RoomMessageText
-
-        client = MagicMock(spec=AsyncClient)
-
-        # Create mock message event
-        msg = MagicMock(spec=RoomMessageText)
-        msg.sender = "@user:matrix.org"
-        msg.body = "Test message"
-        msg.server_timestamp = 1704110400000
-        msg.event_id = "$msg123"
-        msg.source = {"content": {"body": "Test message", "msgtype": "m.text"}}
+        client = async_client
 
         mock_response = MagicMock()
-        mock_response.chunk = [msg]
+        mock_response.chunk = [_MSG]
 
-        client.room_messages = AsyncMock(return_value=mock_response)
+        client.room_messages.return_value = mock_response
 
-        with patch("matty._get_or_create_handle", return_value="m1"):
-            messages = await _get_messages(client, "!room:matrix.org", 10)
+        messages = await _get_messages(client, "!room:matrix.org", 10)
 
         assert len(messages) == 1
         assert messages[0].content == "Test message"
         assert messages[0].handle == "m1"
 
-    @pytest.mark.asyncio
-    async def test_get_threads_with_results(self):
+    async def test_get_threads_with_results(self, async_client):
         """Test getting threads from room."""
-        from nio import RoomMessageText
-
-        client = MagicMock(spec=AsyncClient)
-
-        # Create mock thread root
-        thread_root = MagicMock(spec=RoomMessageText)
-        thread_root.sender = "@user:matrix.org"
-        thread_root.body = "Thread start"
-        thread_root.server_timestamp = 1704110400000
-        thread_root.event_id = "$thread123"
-        thread_root.source = {
-            "content": {
-                "body": "Thread start",
-                "msgtype": "m.text",
-                "m.relates_to": {"rel_type": "m.thread", "event_id": "$thread123"},
-            }
-        }
+        client = async_client
 
         mock_response = MagicMock()
-        mock_response.chunk = [thread_root]
+        mock_response.chunk = [_THREAD_ROOT]
 
-        client.room_messages = AsyncMock(return_value=mock_response)
+        client.room_messages.return_value = mock_response
 
-        with patch("matty._get_or_create_handle", return_value="m1"):
-            threads = await _get_threads(client, "!room:matrix.org")
+        threads = await _get_threads(client, "!room:matrix.org")
         assert len(threads) == 1
         # _get_threads returns list of Message objects that are thread roots
         assert threads[0].event_id == "$thread123"
         assert threads[0].is_thread_root is True
 
-    @pytest.mark.asyncio
-    async def test_execute_messages_command_with_thread(self, capsys):
-        """Test messages command with thread ID."""
-        with patch("matty._create_client") as mock_create:
-            client = MagicMock(spec=AsyncClient)
-            mock_create.return_value = client
-
-            with (
-                patch("matty._login", return_value=True),
-                patch("matty._sync_client"),
-                patch("matty._find_room", return_value=("!room:matrix.org", "Test Room")),
-                patch("matty._resolve_thread_id", return_value=("$thread123", None)),
-                patch("matty._get_thread_messages", return_value=[]),
-            ):
-                client.close = AsyncMock()
-
-                # _execute_messages_command doesn't have thread parameter
-                # Just test without thread parameter
-                await _execute_messages_command(
-                    "Test Room",
-                    10,
-                    "user",
-                    "pass",
-                    OutputFormat.simple,
-                )
-
-        captured = capsys.readouterr()
-        assert "Test Room" in captured.out
-
-    @pytest.mark.asyncio
-    async def test_execute_send_command_error(self, capsys):
+    @pytest.mark.usefixtures("matty_mocks")
+    async def test_execute_send_command_error(self, capsys, monkeypatch):
         """Test send command with error."""
-        with patch("matty._create_client") as mock_create:
-            client = MagicMock(spec=AsyncClient)
-            mock_create.return_value = client
+        monkeypatch.setattr("matty._send_message", AsyncMock(return_value=False))
 
-            with (
-                patch("matty._login", return_value=True),
-                patch("matty._sync_client"),
-                patch("matty._find_room", return_value=("!room:matrix.org", "Test Room")),
-                patch("matty._send_message", return_value=False),
-            ):
-                client.close = AsyncMock()
-
-                await _execute_send_command("Test Room", "Message", "user", "pass")
+        await _execute_send_command("Test Room", "Message", "user", "pass")
 
         captured = capsys.readouterr()
         assert "Failed" in captured.out or "Error" in captured.out
 
-    def test_state_persistence(self, tmp_path, monkeypatch):
-        """Test state persistence across load/save cycles."""
-        state_file = tmp_path / "test.json"
-
-        # Create initial state
-        state1 = ServerState()
-        state1.thread_ids.counter = 10
-        state1.thread_ids.id_to_matrix[1] = "$event1"
-        state1.message_handles.handle_counter["!room"] = 5
-
-        monkeypatch.setattr("matty._state", state1)
-
-        with patch("matty._get_state_file", return_value=state_file):
-            _save_state()
-
-        # Load state back
-        monkeypatch.setattr("matty._state", None)
-
-        with patch("matty._get_state_file", return_value=state_file):
-            state2 = _load_state()
-
-        assert state2.thread_ids.counter == 10
-        assert state2.thread_ids.id_to_matrix[1] == "$event1"
-        assert state2.message_handles.handle_counter["!room"] == 5
-
     def test_parse_mentions_with_full_matrix_id(self):
         """Test parsing mentions with full Matrix IDs."""
-        users = ["@alice:matrix.org", "@bob:matrix.org"]
-        _body, formatted, mentioned = _parse_mentions("Hello @alice:matrix.org", users)
+        _body, formatted, mentioned = _parse_mentions("Hello @alice:matrix.org", _USERS)
         assert mentioned == ["@alice:matrix.org"]
         assert "@alice:matrix.org" in formatted
 
     def test_parse_mentions_mixed(self):
         """Test parsing mixed mention formats."""
-        users = ["@alice:matrix.org", "@bob:matrix.org"]
         _body, _formatted, mentioned = _parse_mentions(
-            "@alice and @bob:matrix.org please review", users
+            "@alice and @bob:matrix.org please review", _USERS
         )
         assert "@alice:matrix.org" in mentioned
         assert "@bob:matrix.org" in mentioned
@@ -288,26 +162,3 @@ class TestEdgeCases:
         content = {"m.relates_to": {"rel_type": "m.thread"}}
         assert _is_relation_type(content, "m.thread") is True
         assert _is_relation_type(content, "m.annotation") is False
-
-    def test_is_relation_type_no_relation(self):
-        """Test checking relation type when no relation."""
-        content = {"body": "message"}
-        assert _is_relation_type(content, "m.thread") is False
-
-    @pytest.mark.asyncio
-    async def test_send_message_with_formatted_body(self):
-        """Test sending message with formatted body."""
-        client = MagicMock(spec=AsyncClient)
-        # Mock the rooms attribute
-        client.rooms = {}
-        response = RoomSendResponse(event_id="$formatted123", room_id="!room:matrix.org")
-        client.room_send = AsyncMock(return_value=response)
-
-        # _send_message doesn't have formatted_body parameter, it parses HTML from message
-        result = await _send_message(client, "!room:matrix.org", "Plain text")
-        assert result is True
-
-        # Verify basic message was sent
-        call_args = client.room_send.call_args
-        content = call_args[1]["content"]
-        assert content["body"] == "Plain text"
@@ -1,76 +1,61 @@
 """Additional tests to improve coverage to >90%."""
 
-from unittest.mock import AsyncMock, MagicMock
+from types import SimpleNamespace
+from unittest.mock import MagicMock
 
 import pytest
-from nio import AsyncClient, ErrorResponse, MatrixRoom
-from typer.testing import CliRunner
+from nio import ErrorResponse
 
 from matty import (
     MessageFetchError,
     _find_room,
     _get_messages,
     _login,
-    _send_message,
     _sync_client,
 )
 
-runner = CliRunner()
-
 
 class TestErrorHandling:
     """Test error handling scenarios."""
 
-    @pytest.mark.asyncio
-    async def test_login_with_error_response(self):
+    async def test_login_with_error_response(self, async_client):
         """Test login with error response."""
-        client = MagicMock(spec=AsyncClient)
+        client = async_client
         error = ErrorResponse("Invalid credentials", "M_FORBIDDEN")
-        client.login = AsyncMock(return_value=error)
+        client.login.return_value = error
 
         result = await _login(client, "wrong_pass")
         assert result is False
 
-    @pytest.mark.asyncio
-    async def test_send_message_exception(self):
-        """Test send message with exception."""
-        client = MagicMock(spec=AsyncClient)
-        client.room_send = AsyncMock(side_effect=Exception("Network error"))
-
-        result = await _send_message(client, "!room:matrix.org", "Test")
-        assert result is False
-
-    @pytest.mark.asyncio
-    async def test_get_messages_error_response(self):
+    async def test_get_messages_error_response(self, async_client):
         """Test get messages with error response."""
-        client = MagicMock(spec=AsyncClient)
+        client = async_client
         error = ErrorResponse("Forbidden", "M_FORBIDDEN")
-        client.room_messages = AsyncMock(return_value=error)
+        client.room_messages.return_value = error
 
         with pytest.raises(MessageFetchError, match="Forbidden"):
             await _get_messages(client, "!room:matrix.org", 10)
 
-    @pytest.mark.asyncio
-    async def test_sync_client_error(self):
+    async def test_sync_client_error(self, async_client):
         """Test sync client with error."""
-        client = MagicMock(spec=AsyncClient)
+        client = async_client
         error = ErrorResponse("Sync failed", "M_UNKNOWN")
-        client.sync = AsyncMock(return_value=error)
+        client.sync.return_value = error
 
         # Should handle error gracefully
         await _sync_client(client)
 
-    @pytest.mark.asyncio
-    async def test_find_room_partial_match(self):
+    async def test_find_room_partial_match(self, async_client):
         """Test finding room with partial name match doesn't work."""
-        client = MagicMock(spec=AsyncClient)
+        client = async_client
 
-        room = MagicMock(spec=MatrixRoom)
-        room.room_id = "!room:matrix.org"
-        room.display_name = "Test Room"
-        room.users = {"@user1:matrix.org": None}
-        room.topic = None
-        room.member_count = 1
+        room = SimpleNamespace(
+            room_id="!room:matrix.org",
+            display_name="Test Room",
+            users={"@user1:matrix.org": None},
+            topic=None,
+            member_count=1,
+        )
 
         client.rooms = {"!room:matrix.org": room}
 
@@ -82,16 +67,16 @@ class TestErrorHandling:
         result = await _find_room(client, "test room")
         assert result == ("!room:matrix.org", "Test Room")
 
-    @pytest.mark.asyncio
-    async def test_find_room_exact_match(self):
+    async def test_find_room_exact_match(self, async_client):
         """Test exact room name matching (case-insensitive)."""
-        client = MagicMock(spec=AsyncClient)
+        client = async_client
 
-        room = MagicMock(spec=MatrixRoom)
-        room.room_id = "!room:matrix.org"
-        room.display_name = "Test Room"
-        room.users = {"@user1:matrix.org": None}
-        room.topic = None
+        room = SimpleNamespace(
+            room_id="!room:matrix.org",
+            display_name="Test Room",
+            users={"@user1:matrix.org": None},
+            topic=None,
+        )
 
         client.rooms = {"!room:matrix.org": room}
 
@@ -103,15 +88,14 @@ class TestErrorHandling:
         result = await _find_room(client, "test")
         assert result is None
 
-    @pytest.mark.asyncio
-    async def test_get_messages_empty_room(self):
+    async def test_get_messages_empty_room(self, async_client):
         """Test getting messages from empty room."""
-        client = MagicMock(spec=AsyncClient)
+        client = async_client
 
         mock_response = MagicMock()
         mock_response.chunk = []
 
-        client.room_messages = AsyncMock(return_value=mock_response)
+        client.room_messages.return_value = mock_response
 
         messages = await _get_messages(client, "!room:matrix.org", limit=10)
         assert messages == []
@@ -1,21 +1,21 @@
 """Tests for matty module."""
 
+from types import SimpleNamespace
 from unittest.mock import MagicMock
 
 import pytest
-from typer.testing import CliRunner
+from nio import LoginError, RoomSendResponse
 
 from matty import (
     Config,
     Message,
     OutputFormat,
     _get_or_create_id,
+    _login,
     _resolve_id,
-    app,
+    _send_message,
 )
 
-runner = CliRunner()
-
 
 def test_config_defaults():
     """Test Config dataclass defaults."""
@@ -33,7 +33,7 @@ def test_message_dataclass():
     msg = Message(
         sender="@user:matrix.org",
         content="Test message",
-        timestamp=datetime.now(UTC),
+        timestamp=datetime(2024, 1, 1, tzinfo=UTC),
         room_id="!room:matrix.org",
         event_id="$event123",
     )
@@ -51,21 +51,10 @@ def test_output_format_enum():
     assert OutputFormat.json == "json"
 
 
-def test_id_mapping_functions(tmp_path, monkeypatch):
+def test_id_mapping_functions(state_file):
     """Test ID mapping functions."""
     import matty
 
-    # Use temporary state directory for testing
-    test_state_dir = tmp_path / ".config" / "matty" / "state"
-    test_state_dir.mkdir(parents=True, exist_ok=True)
-
-    # Patch the state file path to use test directory
-    def _get_test_state_file(server=None):  # noqa: ARG001
-        return test_state_dir / "test.matrix.org.json"
-
-    monkeypatch.setattr("matty._get_state_file", _get_test_state_file)
-    monkeypatch.setattr("matty._state", None)
-
     # Test creating new ID
     matrix_id = "$test123:matrix.org"
     simple_id = _get_or_create_id(matrix_id)
@@ -76,7 +65,6 @@ def test_id_mapping_functions(tmp_path, monkeypatch):
     assert same_id == 1
 
     # Verify the state was saved
-    state_file = test_state_dir / "test.matrix.org.json"
     assert state_file.exists()
 
     # Clear cache and test that ID persists
@@ -85,19 +73,9 @@ def test_id_mapping_functions(tmp_path, monkeypatch):
     assert loaded_id == 1
 
 
-def test_resolve_id(tmp_path, monkeypatch):
+@pytest.mark.usefixtures("state_file")
+def test_resolve_id():
     """Test ID resolution."""
-
-    # Use temporary state directory for testing
-    test_state_dir = tmp_path / ".config" / "matty" / "state"
-    test_state_dir.mkdir(parents=True, exist_ok=True)
-
-    def _get_test_state_file(server=None):  # noqa: ARG001
-        return test_state_dir / "test.matrix.org.json"
-
-    monkeypatch.setattr("matty._get_state_file", _get_test_state_file)
-    monkeypatch.setattr("matty._state", None)
-
     # Setup test data by creating IDs
     _get_or_create_id("$test:matrix.org")  # Will be ID 1
     _get_or_create_id("!room:matrix.org")  # Will be ID 2
@@ -115,56 +93,43 @@ def test_resolve_id(tmp_path, monkeypatch):
     assert _resolve_id("999") is None
 
 
-def test_cli_help():
+def test_cli_help(cli_help):
     """Test CLI help command."""
-    result = runner.invoke(app, ["--help"])
-    assert result.exit_code == 0
-    assert "Functional Matrix CLI client" in result.output
+    output = cli_help()
+    assert "Functional Matrix CLI client" in output
 
 
-def test_rooms_command_help():
+def test_rooms_command_help(cli_help):
     """Test rooms command help."""
-    result = runner.invoke(app, ["rooms", "--help"])
-    assert result.exit_code == 0
-    assert "List all joined rooms" in result.output
+    output = cli_help("rooms")
+    assert "List all joined rooms" in output
 
 
-def test_messages_command_help():
+def test_messages_command_help(cli_help):
     """Test messages command help."""
-    result = runner.invoke(app, ["messages", "--help"])
-    assert result.exit_code == 0
-    assert "messages" in result.output.lower()
+    output = cli_help("messages")
+    assert "messages" in output.lower()
 
 
-@pytest.mark.asyncio
-async def test_login_failure():
+async def test_login_failure(async_client):
     """Test login failure handling."""
-    from nio import AsyncClient, LoginError
-
-    from matty import _login
-
-    client = MagicMock(spec=AsyncClient)
+    client = async_client
     client.login = MagicMock(side_effect=LoginError("Invalid password"))
 
     result = await _login(client, "wrong_password")
     assert result is False
 
 
-@pytest.mark.asyncio
-async def test_send_message_success():
+async def test_send_message_success(async_client):
     """Test successful message sending."""
-    from unittest.mock import AsyncMock
-
-    from nio import AsyncClient, RoomSendResponse
-
-    from matty import _send_message
-
-    client = MagicMock(spec=AsyncClient)
+    client = async_client
     response = RoomSendResponse("$event123", "!room:matrix.org")
-    client.room_send = AsyncMock(return_value=response)
+    client.room_send.return_value = response
     # Add rooms attribute for mention parsing
     client.rooms = {
-        "!room:matrix.org": MagicMock(users={"@user1:matrix.org": {}, "@user2:matrix.org": {}})
+        "!room:matrix.org": SimpleNamespace(
+            users={"@user1:matrix.org": {}, "@user2:matrix.org": {}}
+        )
     }
 
     result = await _send_message(client, "!room:matrix.org", "Test message")
@@ -172,21 +137,16 @@ async def test_send_message_success():
     client.room_send.assert_called_once()
 
 
-@pytest.mark.asyncio
-async def test_send_message_with_thread():
+async def test_send_message_with_thread(async_client):
     """Test sending message in thread."""
-    from unittest.mock import AsyncMock
-
-    from nio import AsyncClient, RoomSendResponse
-
-    from matty import _send_message
-
-    client = MagicMock(spec=AsyncClient)
+    client = async_client
     response = RoomSendResponse("$event456", "!room:matrix.org")
-    client.room_send = AsyncMock(return_value=response)
+    client.room_send.return_value = response
     # Add rooms attribute for mention parsing
     client.rooms = {
-        "!room:matrix.org": MagicMock(users={"@user1:matrix.org": {}, "@user2:matrix.org": {}})
+        "!room:matrix.org": SimpleNamespace(
+            users={"@user1:matrix.org": {}, "@user2:matrix.org": {}}
+        )
     }
 
     result = await _send_message(
@@ -1,10 +1,8 @@
 """Additional tests to improve coverage to >90%."""
 
+from types import SimpleNamespace
 from unittest.mock import MagicMock
 
-from nio import AsyncClient, MatrixRoom
-from typer.testing import CliRunner
-
 from matty import (
     _build_edit_content,
     _build_message_content,
@@ -15,8 +13,6 @@ from matty import (
     _is_relation_type,
 )
 
-runner = CliRunner()
-
 
 class TestMatrixProtocolHelpers:
     """Test Matrix protocol helper functions."""
@@ -153,15 +149,16 @@ class TestMatrixProtocolHelpers:
         assert content["m.mentions"] == {"user_ids": ["@user:matrix.org"]}
         assert content["m.new_content"]["m.mentions"] == {"user_ids": ["@user:matrix.org"]}
 
-    def test_get_room_users(self):
+    def test_get_room_users(self, async_client):
         """Test getting users from a room."""
-        client = MagicMock(spec=AsyncClient)
-        room = MagicMock(spec=MatrixRoom)
-        room.users = {
-            "@user1:matrix.org": None,
-            "@user2:matrix.org": None,
-            "@user3:matrix.org": None,
-        }
+        client = async_client
+        room = SimpleNamespace(
+            users={
+                "@user1:matrix.org": None,
+                "@user2:matrix.org": None,
+                "@user3:matrix.org": None,
+            },
+        )
         client.rooms = {"!room:matrix.org": room}
 
         users = _get_room_users(client, "!room:matrix.org")
@@ -170,9 +167,9 @@ class TestMatrixProtocolHelpers:
         assert "@user2:matrix.org" in users
         assert "@user3:matrix.org" in users
 
-    def test_get_room_users_not_found(self):
+    def test_get_room_users_not_found(self, async_client):
         """Test getting users from non-existent room."""
-        client = MagicMock(spec=AsyncClient)
+        client = async_client
         client.rooms = {}
         users = _get_room_users(client, "!nonexistent:matrix.org")
         assert users == []
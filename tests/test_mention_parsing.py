@@ -1,13 +1,9 @@
 """Additional tests to improve coverage to >90%."""
 
-from typer.testing import CliRunner
-
 from matty import (
     _parse_mentions,
 )
 
-runner = CliRunner()
-
 
 class TestMentionParsing:
     """Test mention parsing functionality."""
@@ -31,6 +27,14 @@ class TestMentionParsing:
         assert "@alice:matrix.org" in formatted_body
         assert "@bob:matrix.org" in formatted_body
 
+    def test_parse_mentions_repeated(self):
+        """Test that a repeated mention is linked once per occurrence, not nested."""
+        users = ["@alice:matrix.org"]
+        _, formatted_body, mentioned_user_ids = _parse_mentions("@alice hi @alice", users)
+        assert mentioned_user_ids == ["@alice:matrix.org"]
+        link = '<a href="https://matrix.to/#/@alice:matrix.org">@alice:matrix.org</a>'
+        assert formatted_body == f"{link} hi {link}"
+
     def test_parse_mentions_none(self):
         """Test parsing with no mentions."""
         users = ["@alice:matrix.org", "@bob:matrix.org"]
@@ -1,15 +1,11 @@
 """Additional tests to improve coverage to >90%."""
 
-from typer.testing import CliRunner
-
 from matty import (
     MessageHandleMapping,
     ServerState,
     ThreadIdMapping,
 )
 
-runner = CliRunner()
-
 
 class TestPydanticModels:
     """Test Pydantic model validation."""
@@ -1,9 +1,6 @@
 """More tests to reach >90% coverage."""
 
-from unittest.mock import AsyncMock, MagicMock
-
-import pytest
-from nio import AsyncClient, RoomRedactResponse, RoomSendResponse
+from nio import RoomRedactResponse, RoomSendResponse
 
 from matty import (
     _send_reaction,
@@ -13,12 +10,11 @@ from matty import (
 class TestReactionsAndRedactions:
     """Test reaction and redaction functionality."""
 
-    @pytest.mark.asyncio
-    async def test_send_reaction_success(self):
+    async def test_send_reaction_success(self, async_client):
         """Test successful reaction send."""
-        client = MagicMock(spec=AsyncClient)
+        client = async_client
         response = RoomSendResponse(event_id="$reaction123", room_id="!room:matrix.org")
-        client.room_send = AsyncMock(return_value=response)
+        client.room_send.return_value = response
 
         result = await _send_reaction(client, "!room:matrix.org", "$msg123", "👍")
         assert result is True
@@ -30,21 +26,19 @@ class TestReactionsAndRedactions:
         assert content["m.relates_to"]["event_id"] == "$msg123"
         assert content["m.relates_to"]["key"] == "👍"
 
-    @pytest.mark.asyncio
-    async def test_send_reaction_failure(self):
+    async def test_send_reaction_failure(self, async_client):
         """Test reaction send failure."""
-        client = MagicMock(spec=AsyncClient)
-        client.room_send = AsyncMock(side_effect=Exception("Network error"))
+        client = async_client
+        client.room_send.side_effect = Exception("Network error")
 
         result = await _send_reaction(client, "!room:matrix.org", "$msg123", "👍")
         assert result is False
 
-    @pytest.mark.asyncio
-    async def test_room_redact_success(self):
+    async def test_room_redact_success(self, async_client):
         """Test successful redaction via room_redact."""
-        client = MagicMock(spec=AsyncClient)
+        client = async_client
         response = RoomRedactResponse(event_id="$redaction123", room_id="!room:matrix.org")
-        client.room_redact = AsyncMock(return_value=response)
+        client.room_redact.return_value = response
 
         # Directly test the client method since _send_redaction doesn't exist
         result = await client.room_redact("!room:matrix.org", "$msg456", reason="Mistake")
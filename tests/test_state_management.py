@@ -1,20 +1,21 @@
 """Additional tests to improve coverage to >90%."""
 
 import json
+from datetime import UTC, datetime
 from unittest.mock import patch
 
-from typer.testing import CliRunner
+import pytest
 
 from matty import (
+    Message,
     ServerState,
+    _assign_message_handles,
     _get_state_file,
     _load_state,
     _lookup_mapping,
     _save_state,
 )
 
-runner = CliRunner()
-
 
 class TestStateManagement:
     """Test state file management functions."""
@@ -35,22 +36,16 @@ class TestStateManagement:
         result = _get_state_file("matrix.example.com")
         assert result.name == "matrix.example.com.json"
 
-    def test_load_state_new_file(self, tmp_path, monkeypatch):
+    @pytest.mark.usefixtures("state_file")
+    def test_load_state_new_file(self):
         """Test loading state when file doesn't exist."""
-        monkeypatch.setattr("matty._state", None)
-        state_file = tmp_path / "test.json"
+        state = _load_state()
+        assert isinstance(state, ServerState)
+        assert state.thread_ids.counter == 0
+        assert state.message_handles.handle_counter == {}
 
-        with patch("matty._get_state_file", return_value=state_file):
-            state = _load_state()
-            assert isinstance(state, ServerState)
-            assert state.thread_ids.counter == 0
-            assert state.message_handles.handle_counter == {}
-
-    def test_load_state_existing_file(self, tmp_path, monkeypatch):
+    def test_load_state_existing_file(self, state_file):
         """Test loading state from existing file."""
-        monkeypatch.setattr("matty._state", None)
-        state_file = tmp_path / "test.json"
-
         # Create a state file
         state_data = {
             "thread_ids": {
@@ -66,24 +61,17 @@ class TestStateManagement:
         }
         state_file.write_text(json.dumps(state_data))
 
-        with patch("matty._get_state_file", return_value=state_file):
-            state = _load_state()
-            assert state.thread_ids.counter == 5
-            assert state.thread_ids.id_to_matrix[1] == "$event1"
-            assert state.message_handles.handle_counter["!room1"] == 10
+        state = _load_state()
+        assert state.thread_ids.counter == 5
+        assert state.thread_ids.id_to_matrix[1] == "$event1"
+        assert state.message_handles.handle_counter["!room1"] == 10
 
-    def test_save_state(self, tmp_path, monkeypatch):
+    def test_save_state(self, state_file, fresh_state):
         """Test saving state to file."""
-        state_file = tmp_path / "test.json"
-        state = ServerState()
-        state.thread_ids.counter = 3
-        state.thread_ids.id_to_matrix[1] = "$test"
-
-        # Set the global state
-        monkeypatch.setattr("matty._state", state)
+        fresh_state.thread_ids.counter = 3
+        fresh_state.thread_ids.id_to_matrix[1] = "$test"
 
-        with patch("matty._get_state_file", return_value=state_file):
-            _save_state()  # No arguments needed
+        _save_state()  # No arguments needed
 
         # Verify file was written
         assert state_file.exists()
@@ -91,12 +79,47 @@ class TestStateManagement:
         assert data["thread_ids"]["counter"] == 3
         assert data["thread_ids"]["id_to_matrix"]["1"] == "$test"
 
-    def test_lookup_mapping_thread_ids(self, monkeypatch):
+    @pytest.mark.usefixtures("state_file")
+    def test_save_and_load_state_round_trip(self, monkeypatch, fresh_state):
+        """Integer thread IDs should survive a save/load cycle."""
+        fresh_state.thread_ids.counter = 1
+        fresh_state.thread_ids.id_to_matrix[1] = "$root"
+        fresh_state.thread_ids.matrix_to_id["$root"] = 1
+        fresh_state.message_handles.handle_counter["!room"] = 2
+
+        _save_state()
+        monkeypatch.setattr("matty._state", None)
+        loaded = _load_state()
+
+        assert loaded == fresh_state
+        assert loaded.thread_ids.id_to_matrix[1] == "$root"
+
+    @pytest.mark.usefixtures("fresh_state", "state_file")
+    def test_assign_message_handles_saves_state_once(self):
+        """Minting handles for a page of new messages should write the state file once."""
+        messages = [
+            Message(
+                sender="@alice:matrix.org",
+                content=f"msg {i}",
+                timestamp=datetime(2024, 1, 1, tzinfo=UTC),
+                room_id="!room:matrix.org",
+                event_id=f"$event{i}",
+                thread_root_id="$root",
+            )
+            for i in range(3)
+        ]
+
+        with patch.object(ServerState, "model_dump_json", return_value="{}") as mock_dump:
+            _assign_message_handles(messages)
+
+        assert [m.handle for m in messages] == ["m1", "m2", "m3"]
+        assert all(m.thread_handle == "t1" for m in messages)
+        mock_dump.assert_called_once()
+
+    def test_lookup_mapping_thread_ids(self, fresh_state):
         """Test looking up thread ID mappings."""
-        state = ServerState()
-        state.thread_ids.id_to_matrix[1] = "$event123"
-        state.thread_ids.matrix_to_id["$event123"] = 1
-        monkeypatch.setattr("matty._state", state)
+        fresh_state.thread_ids.id_to_matrix[1] = "$event123"
+        fresh_state.thread_ids.matrix_to_id["$event123"] = 1
 
         # Test forward lookup
         result = _lookup_mapping("thread_ids", "1", reverse=True)
@@ -110,13 +133,11 @@ class TestStateManagement:
         result = _lookup_mapping("thread_ids", "invalid", reverse=True)
         assert result is None
 
-    def test_lookup_mapping_message_handles(self, monkeypatch):
+    def test_lookup_mapping_message_handles(self, fresh_state):
         """Test looking up message handle mappings."""
-        state = ServerState()
         room_id = "!room:matrix.org"
-        state.message_handles.room_handles[room_id] = {"$msg1": "m1"}
-        state.message_handles.room_handle_to_event[room_id] = {"m1": "$msg1"}
-        monkeypatch.setattr("matty._state", state)
+        fresh_state.message_handles.room_handles[room_id] = {"$msg1": "m1"}
+        fresh_state.message_handles.room_handle_to_event[room_id] = {"m1": "$msg1"}
 
         # Test forward lookup (event_id -> handle)
         result = _lookup_mapping("message_handles", "$msg1", room_id=room_id, reverse=False)
@@ -1,10 +1,9 @@
 """More tests to reach >90% coverage."""
 
 from datetime import UTC, datetime
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock
 
 import pytest
-from nio import AsyncClient
 
 from matty import (
     Message,
@@ -16,40 +15,30 @@ from matty import (
 class TestThreadExecution:
     """Test thread-related command execution."""
 
-    @pytest.mark.asyncio
-    async def test_execute_messages_with_thread_success(self, capsys):
+    @pytest.mark.usefixtures("matty_mocks")
+    async def test_execute_messages_with_thread_success(self, capsys, monkeypatch):
         """Test messages command with thread parameter."""
-        with patch("matty._create_client") as mock_create:
-            client = MagicMock(spec=AsyncClient)
-            mock_create.return_value = client
-
-            with (
-                patch("matty._login", return_value=True),
-                patch("matty._sync_client"),
-                patch("matty._find_room", return_value=("!room:matrix.org", "Test Room")),
-                patch("matty._resolve_thread_id", return_value=("$thread123", None)),
-            ):
-                messages = [
-                    Message(
-                        sender="@alice:matrix.org",
-                        content="Thread message",
-                        timestamp=datetime.now(UTC),
-                        room_id="!room:matrix.org",
-                        event_id="$msg1",
-                        handle="m1",
-                    )
-                ]
-                with patch("matty._get_thread_messages", return_value=messages):
-                    client.close = AsyncMock()
-
-                    # _execute_messages_command doesn't have thread parameter
-                    await _execute_messages_command(
-                        "Test Room",
-                        10,
-                        "user",
-                        "pass",
-                        OutputFormat.simple,
-                    )
+        messages = [
+            Message(
+                sender="@alice:matrix.org",
+                content="Thread message",
+                timestamp=datetime(2024, 1, 1, tzinfo=UTC),
+                room_id="!room:matrix.org",
+                event_id="$msg1",
+                handle="m1",
+            )
+        ]
+        monkeypatch.setattr("matty._resolve_thread_id", lambda _tid: ("$thread123", None))
+        monkeypatch.setattr("matty._get_thread_messages", AsyncMock(return_value=messages))
+
+        # _execute_messages_command doesn't have thread parameter
+        await _execute_messages_command(
+            "Test Room",
+            10,
+            "user",
+            "pass",
+            OutputFormat.simple,
+        )
 
         captured = capsys.readouterr()
         assert "Test Room" in captured.out or "Thread" in captured.out
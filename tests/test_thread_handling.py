@@ -1,65 +1,45 @@
 """Additional tests to improve coverage to >90%."""
 
-from datetime import UTC, datetime
-from unittest.mock import AsyncMock, MagicMock, patch
-
-import pytest
-from nio import AsyncClient
-from typer.testing import CliRunner
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
 
 from matty import (
+    Message,
     _get_message_by_handle,
     _get_thread_messages,
     _get_threads,
 )
-
-runner = CliRunner()
+from tests.helpers import text_event
 
 
 class TestThreadHandling:
     """Test thread handling functionality."""
 
-    @pytest.mark.asyncio
-    async def test_get_threads_empty(self):
+    async def test_get_threads_empty(self, async_client):
         """Test getting threads from room with no threads."""
-        client = MagicMock(spec=AsyncClient)
+        client = async_client
 
         mock_response = MagicMock()
         mock_response.chunk = []
 
-        client.room_messages = AsyncMock(return_value=mock_response)
+        client.room_messages.return_value = mock_response
 
         threads = await _get_threads(client, "!room:matrix.org")
         assert threads == []
 
-    @pytest.mark.asyncio
-    async def test_get_thread_messages_with_deleted_root(self):
+    async def test_get_thread_messages_with_deleted_root(self, async_client):
         """Test getting thread messages when root is deleted."""
-        from nio import RoomMessageText
-
-        client = MagicMock(spec=AsyncClient)
-
-        # Create mock events - only replies, no root
-        reply1 = MagicMock(spec=RoomMessageText)
-        reply1.sender = "@user:matrix.org"
-        reply1.body = "Reply 1"
-        reply1.server_timestamp = 1704110500000
-        reply1.event_id = "$reply1"
-        reply1.source = {
-            "content": {
-                "body": "Reply 1",
-                "msgtype": "m.text",
-                "m.relates_to": {
-                    "rel_type": "m.thread",
-                    "event_id": "$missing_root",
-                },
-            }
-        }
-
-        mock_response = MagicMock()
-        mock_response.chunk = [reply1]
-
-        client.room_messages = AsyncMock(return_value=mock_response)
+        client = async_client
+
+        # Only replies, no root
+        reply1 = text_event(
+            "$reply1",
+            "Reply 1",
+            1704110500000,
+            content={"m.relates_to": {"rel_type": "m.thread", "event_id": "$missing_root"}},
+        )
+        client.room_messages.return_value = SimpleNamespace(chunk=[reply1])
 
         with patch("matty._get_or_create_handle", return_value="m1"):
             messages = await _get_thread_messages(client, "!room:matrix.org", "$missing_root")
@@ -70,28 +50,21 @@ class TestThreadHandling:
         assert "not available" in messages[0].content
         assert messages[1].content == "Reply 1"
 
-    @pytest.mark.asyncio
-    async def test_get_message_by_handle_not_found(self):
+    async def test_get_message_by_handle_not_found(self, async_client):
         """Test getting message by handle when not found."""
-        client = MagicMock(spec=AsyncClient)
+        client = async_client
 
         mock_response = MagicMock()
         mock_response.chunk = []
 
-        client.room_messages = AsyncMock(return_value=mock_response)
+        client.room_messages.return_value = mock_response
 
         with patch("matty._lookup_mapping", return_value=None):
             msg = await _get_message_by_handle(client, "!room:matrix.org", "m999")
             assert msg is None
 
-    @pytest.mark.asyncio
     async def test_deleted_thread_root(self, mock_client):
         """Test handling of deleted thread root messages."""
-        from datetime import timedelta
-        from unittest.mock import patch
-
-        from matty import Message, _get_thread_messages
-
         # Mock _get_messages to return thread replies without the root
         thread_root_id = "$deleted_root_event"
 
@@ -150,13 +123,8 @@ class TestThreadHandling:
             assert thread_messages[1].event_id == "$reply1"
             assert thread_messages[2].event_id == "$reply2"
 
-    @pytest.mark.asyncio
     async def test_normal_thread_with_root(self, mock_client):
         """Test normal thread with root message present."""
-        from unittest.mock import patch
-
-        from matty import Message, _get_thread_messages
-
         thread_root_id = "$root_event"
 
         # Create mock messages including root
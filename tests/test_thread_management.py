@@ -1,24 +1,19 @@
 """Additional tests to improve coverage to >90%."""
 
-from typer.testing import CliRunner
+import pytest
 
 from matty import (
-    ServerState,
     _resolve_thread_id,
 )
 
-runner = CliRunner()
-
 
 class TestThreadManagement:
     """Test thread ID resolution and management."""
 
-    def test_resolve_thread_id_with_t_prefix(self, monkeypatch):
+    def test_resolve_thread_id_with_t_prefix(self, fresh_state):
         """Test resolving thread ID with t prefix."""
-        state = ServerState()
-        state.thread_ids.id_to_matrix[5] = "$thread_event"
-        state.thread_ids.matrix_to_id["$thread_event"] = 5
-        monkeypatch.setattr("matty._state", state)
+        fresh_state.thread_ids.id_to_matrix[5] = "$thread_event"
+        fresh_state.thread_ids.matrix_to_id["$thread_event"] = 5
 
         result, error = _resolve_thread_id("t5")
         assert result == "$thread_event"
@@ -30,11 +25,9 @@ class TestThreadManagement:
         assert result == "$direct_event_id"
         assert error is None
 
-    def test_resolve_thread_id_invalid(self, monkeypatch):
+    @pytest.mark.usefixtures("fresh_state")
+    def test_resolve_thread_id_invalid(self):
         """Test resolving invalid thread ID."""
-        state = ServerState()
-        monkeypatch.setattr("matty._state", state)
-
         # Test with t prefix but no mapping
         result, error = _resolve_thread_id("t999")
         assert result is None
@@ -5,23 +5,43 @@ from datetime import UTC, datetime
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from nio import SyncResponse
 from rich.markdown import Markdown as RichMarkdown
 from textual.widgets import ListView, OptionList, RichLog
 
 from matty import Config, Message, Room
 from matty.tui import (
+    _MAX_PANE_MESSAGES,
     _MAX_POLL_FAILURES,
     SLASH_COMMANDS,
     MattyApp,
     MessageInput,
     RoomItem,
     ThreadItem,
+    _appended_messages,
     _format_message_line,
     _format_sender,
+    _message_header,
     _new_message_ids,
     _reactions_equal,
+    _reactions_line,
+    _sync_has_room_events,
 )
 
+
+def _msg(event_id: str, content: str = "hi") -> Message:
+    return Message(
+        sender="@a:x",
+        content=content,
+        timestamp=datetime(2024, 1, 1, tzinfo=UTC),
+        room_id="!r:x",
+        event_id=event_id,
+    )
+
+
+# Read-only messages shared by the pure list-diff helper tests
+_MSG_1, _MSG_2, _MSG_3 = _msg("$1"), _msg("$2"), _msg("$3")
+
 # =============================================================================
 # Unit tests for helper functions
 # =============================================================================
@@ -84,6 +104,15 @@ class TestFormatMessageLine:
         assert "↳" in header
         assert "t1" in header
 
+    def test_header_built_once_per_message(self):
+        msg = self._make_msg()
+        first = _format_message_line(msg)[0]
+        second = _format_message_line(msg)[0]
+        assert first == second
+        info = _message_header.cache_info()
+        assert info.misses == 1
+        assert info.hits == 1
+
     def test_message_with_reactions(self):
         msg = self._make_msg(reactions={"👍": ["@bob:matrix.org", "@charlie:matrix.org"]})
         parts = _format_message_line(msg)
@@ -93,6 +122,16 @@ class TestFormatMessageLine:
         assert "2" in reaction_line
         assert "Reactions" in reaction_line
 
+    def test_reactions_line_rebuilt_only_when_counts_change(self):
+        msg = self._make_msg(reactions={"👍": ["@bob:matrix.org"]})
+        first = _format_message_line(msg)[2]
+        assert _format_message_line(msg)[2] == first
+        msg.reactions["👍"].append("@charlie:matrix.org")
+        assert "👍 2" in _format_message_line(msg)[2]
+        info = _reactions_line.cache_info()
+        assert info.misses == 2
+        assert info.hits == 1
+
     def test_message_without_handle(self):
         msg = self._make_msg(handle=None)
         parts = _format_message_line(msg)
@@ -204,6 +243,7 @@ class TestMattyAppInit:
         binding_keys = [b.key for b in app.BINDINGS]
         assert "ctrl+q" in binding_keys
         assert "ctrl+r" in binding_keys
+        assert "f5" in binding_keys
         assert "ctrl+t" in binding_keys
         assert "ctrl+s" in binding_keys
 
@@ -379,13 +419,12 @@ class TestMattyAppAsync:
                 new_callable=AsyncMock,
                 side_effect=delayed_send,
             ) as mock_send,
-            patch("matty.tui._sync_client", new_callable=AsyncMock) as mock_sync,
+            patch("matty.tui._sync_client", new_callable=AsyncMock),
         ):
             async with app.run_test(size=(120, 40)) as pilot:
                 app.client = AsyncMock()
                 app._authenticated = True
                 app.current_room_id = "!room:test.org"
-                app._refresh_messages = AsyncMock()
 
                 app._send_user_message("first")
                 await asyncio.wait_for(first_started.wait(), timeout=1.0)
@@ -394,12 +433,50 @@ class TestMattyAppAsync:
 
                 for _ in range(20):
                     await pilot.pause()
-                    if mock_sync.await_count == 2:
+                    if mock_send.await_count == 2 and not any(
+                        w.group == "send" for w in app.workers
+                    ):
                         break
 
                 assert mock_send.await_count == 2
-                assert mock_sync.await_count == 2
-                assert app._refresh_messages.await_count == 2
+
+    async def test_send_rejected_when_too_many_workers_in_flight(self, tui_config):
+        """Submitting past the worker cap should keep the draft as typed and not send."""
+        app = MattyApp(config=tui_config)
+        first_started = asyncio.Event()
+        release_first = asyncio.Event()
+
+        async def blocked_send(*_args, **_kwargs):
+            first_started.set()
+            await release_first.wait()
+            return True
+
+        with (
+            patch("matty.tui._MAX_PENDING_WORKERS", 1),
+            patch(
+                "matty.tui._send_message", new_callable=AsyncMock, side_effect=blocked_send
+            ) as mock_send,
+            patch("matty.tui._sync_client", new_callable=AsyncMock),
+        ):
+            async with app.run_test(size=(120, 40)) as pilot:
+                app.client = AsyncMock()
+                app._authenticated = True
+                app.current_room_id = "!room:test.org"
+                app._refresh_messages = AsyncMock()
+
+                input_widget = app.query_one("#message-input", MessageInput)
+                input_widget.focus()
+                input_widget.text = "first"
+                await pilot.press("ctrl+s")
+                await asyncio.wait_for(first_started.wait(), timeout=1.0)
+
+                input_widget.text = "  second\n"
+                await pilot.press("ctrl+s")
+                await pilot.pause()
+
+                assert mock_send.await_count == 1
+                assert input_widget.text == "  second\n"
+                release_first.set()
 
     async def test_poll_refreshes_threads_when_messages_change(self, tui_config):
         app = MattyApp(config=tui_config)
@@ -423,18 +500,19 @@ class TestMattyAppAsync:
         app._polling = True
         app._fetch_messages = AsyncMock(return_value=[new_message])
         app._render_messages = MagicMock()
-        app._refresh_threads = AsyncMock()
+        app._fetch_threads = AsyncMock(return_value=[])
+        app._show_threads = MagicMock()
 
         async def stop_after_one_tick(*_args, **_kwargs):
             app._polling = False
 
         with (
-            patch("matty.tui.asyncio.sleep", new=AsyncMock(side_effect=stop_after_one_tick)),
+            patch.object(app, "_wait_for_poll", new=AsyncMock(side_effect=stop_after_one_tick)),
             patch("matty.tui._sync_client", new_callable=AsyncMock),
         ):
             await MattyApp._poll_messages.__wrapped__(app)
 
-        app._refresh_threads.assert_awaited_once()
+        app._show_threads.assert_called_once_with([])
 
     async def test_poll_notifies_after_max_failures(self, tui_config):
         """After _MAX_POLL_FAILURES consecutive errors the user should be notified."""
@@ -459,7 +537,7 @@ class TestMattyAppAsync:
         app.notify = capture_notify
 
         with (
-            patch("matty.tui.asyncio.sleep", new=AsyncMock(side_effect=stop_after_n_ticks)),
+            patch.object(app, "_wait_for_poll", new=AsyncMock(side_effect=stop_after_n_ticks)),
             patch(
                 "matty.tui._sync_client",
                 new_callable=AsyncMock,
@@ -481,13 +559,14 @@ class TestMattyAppAsync:
         app.messages = []
         app._fetch_messages = AsyncMock(return_value=[])
         app._render_messages = MagicMock()
-        app._refresh_threads = AsyncMock()
+        app._fetch_threads = AsyncMock(return_value=[])
+        app._show_threads = MagicMock()
 
         async def stop_after_one_tick(*_args, **_kwargs):
             app._polling = False
 
         with (
-            patch("matty.tui.asyncio.sleep", new=AsyncMock(side_effect=stop_after_one_tick)),
+            patch.object(app, "_wait_for_poll", new=AsyncMock(side_effect=stop_after_one_tick)),
             patch("matty.tui._sync_client", new_callable=AsyncMock),
         ):
             await MattyApp._poll_messages.__wrapped__(app)
@@ -502,14 +581,14 @@ class TestMattyAppAsync:
         app._polling = True
         app._poll_failures = _MAX_POLL_FAILURES  # Already at failure threshold
 
-        sleep_delays: list[float] = []
+        wait_delays: list[float] = []
 
-        async def capture_sleep(delay):
-            sleep_delays.append(delay)
+        async def capture_wait(delay):
+            wait_delays.append(delay)
             app._polling = False  # Stop after one iteration
 
         with (
-            patch("matty.tui.asyncio.sleep", new=AsyncMock(side_effect=capture_sleep)),
+            patch.object(app, "_wait_for_poll", new=AsyncMock(side_effect=capture_wait)),
             patch(
                 "matty.tui._sync_client",
                 new_callable=AsyncMock,
@@ -521,7 +600,126 @@ class TestMattyAppAsync:
         # With _poll_failures == _MAX_POLL_FAILURES, backoff should be > POLL_INTERVAL_S
         from matty.tui import POLL_INTERVAL_S
 
-        assert sleep_delays[0] > POLL_INTERVAL_S
+        assert wait_delays[0] > POLL_INTERVAL_S
+
+    async def test_wait_for_poll_wakes_on_request(self, tui_config):
+        """A requested poll should cut the interval short and reset the trigger."""
+        app = MattyApp(config=tui_config)
+
+        app._request_poll()
+        requested = await asyncio.wait_for(app._wait_for_poll(60), timeout=1.0)
+
+        assert requested is True
+        assert not app._poll_wakeup.is_set()
+
+    async def test_wait_for_poll_reports_timeout(self, tui_config):
+        """A poll that simply came due should not count as requested."""
+        app = MattyApp(config=tui_config)
+        assert await app._wait_for_poll(0) is False
+
+    async def test_poll_skips_fetch_when_sync_has_no_room_events(self, tui_config):
+        """An idle sync for the current room should not refetch messages or threads."""
+        app = MattyApp(config=tui_config)
+        app.current_room_id = "!lobby:test.org"
+        app.client = AsyncMock()
+        app._polling = True
+        app._fetch_messages = AsyncMock(return_value=[])
+        app._fetch_threads = AsyncMock(return_value=[])
+        idle_sync = MagicMock(spec=SyncResponse)
+        idle_sync.rooms = MagicMock(join={})
+
+        async def stop_after_one_tick(*_args, **_kwargs):
+            app._polling = False
+            return False
+
+        with (
+            patch.object(app, "_wait_for_poll", new=AsyncMock(side_effect=stop_after_one_tick)),
+            patch("matty.tui._sync_client", new_callable=AsyncMock, return_value=idle_sync),
+        ):
+            await MattyApp._poll_messages.__wrapped__(app)
+
+        app._fetch_messages.assert_not_called()
+        app._fetch_threads.assert_not_called()
+
+    async def test_poll_fetches_after_room_switch_during_sync(self, tui_config):
+        """A switch while the sync is in flight must refetch for the new room.
+
+        The sync token has already moved past whatever it returned, so
+        skipping here would hide the new room's events until the next one.
+        """
+        app = MattyApp(config=tui_config)
+        app.current_room_id = "!lobby:test.org"
+        app.client = AsyncMock()
+        app._polling = True
+        app._fetch_messages = AsyncMock(return_value=[])
+        app._fetch_threads = AsyncMock(return_value=[])
+        app._show_threads = MagicMock()
+        idle_sync = MagicMock(spec=SyncResponse)
+        idle_sync.rooms = MagicMock(join={})
+
+        async def switch_room_during_sync(*_args, **_kwargs):
+            app.current_room_id = "!dev:test.org"
+            return idle_sync
+
+        async def stop_after_one_tick(*_args, **_kwargs):
+            app._polling = False
+            return False
+
+        with (
+            patch.object(app, "_wait_for_poll", new=AsyncMock(side_effect=stop_after_one_tick)),
+            patch("matty.tui._sync_client", new=AsyncMock(side_effect=switch_room_during_sync)),
+        ):
+            await MattyApp._poll_messages.__wrapped__(app)
+
+        app._fetch_messages.assert_awaited_once()
+
+    async def test_requested_poll_fetches_even_when_sync_is_idle(self, tui_config):
+        """User-triggered polls refetch regardless of what the sync returned."""
+        app = MattyApp(config=tui_config)
+        app.current_room_id = "!lobby:test.org"
+        app.client = AsyncMock()
+        app._polling = True
+        app._fetch_messages = AsyncMock(return_value=[])
+        app._fetch_threads = AsyncMock(return_value=[])
+        app._show_threads = MagicMock()
+        idle_sync = MagicMock(spec=SyncResponse)
+        idle_sync.rooms = MagicMock(join={})
+
+        async def stop_after_requested_tick(*_args, **_kwargs):
+            app._polling = False
+            return True
+
+        with (
+            patch.object(
+                app, "_wait_for_poll", new=AsyncMock(side_effect=stop_after_requested_tick)
+            ),
+            patch("matty.tui._sync_client", new_callable=AsyncMock, return_value=idle_sync),
+        ):
+            await MattyApp._poll_messages.__wrapped__(app)
+
+        app._fetch_messages.assert_awaited_once()
+
+    async def test_poll_skips_threads_when_hidden(self, tui_config):
+        """Polling should not fetch threads while the thread panel is hidden."""
+        app = MattyApp(config=tui_config)
+        app.current_room_id = "!lobby:test.org"
+        app.client = AsyncMock()
+        app._polling = True
+        app._threads_visible = False
+        app._fetch_messages = AsyncMock(return_value=[])
+        app._fetch_threads = AsyncMock(return_value=[])
+        app._show_threads = MagicMock()
+
+        async def stop_after_one_tick(*_args, **_kwargs):
+            app._polling = False
+
+        with (
+            patch.object(app, "_wait_for_poll", new=AsyncMock(side_effect=stop_after_one_tick)),
+            patch("matty.tui._sync_client", new_callable=AsyncMock),
+        ):
+            await MattyApp._poll_messages.__wrapped__(app)
+
+        app._fetch_threads.assert_not_called()
 
     async def test_poll_refreshes_threads_even_when_messages_unchanged(self, tui_config):
         """Thread sidebar should refresh on every successful poll, not just when messages change."""
@@ -540,19 +738,55 @@ class TestMattyAppAsync:
         # Return identical messages so _messages_changed returns False
         app._fetch_messages = AsyncMock(return_value=[msg])
         app._render_messages = MagicMock()
-        app._refresh_threads = AsyncMock()
+        app._fetch_threads = AsyncMock(return_value=[])
+        app._show_threads = MagicMock()
 
         async def stop_after_one_tick(*_args, **_kwargs):
             app._polling = False
 
         with (
-            patch("matty.tui.asyncio.sleep", new=AsyncMock(side_effect=stop_after_one_tick)),
+            patch.object(app, "_wait_for_poll", new=AsyncMock(side_effect=stop_after_one_tick)),
             patch("matty.tui._sync_client", new_callable=AsyncMock),
         ):
             await MattyApp._poll_messages.__wrapped__(app)
 
         # Threads should still be refreshed even though messages didn't change
-        app._refresh_threads.assert_awaited_once()
+        app._show_threads.assert_called_once_with([])
+
+    async def test_poll_fetches_messages_and_threads_concurrently(self, tui_config):
+        """A poll tick should overlap the message and thread fetches."""
+        app = MattyApp(config=tui_config)
+        app.current_room_id = "!lobby:test.org"
+        app.client = AsyncMock()
+        app._polling = True
+        app._show_threads = MagicMock()
+        messages_started = asyncio.Event()
+        threads_started = asyncio.Event()
+
+        async def fetch_messages():
+            messages_started.set()
+            await threads_started.wait()
+            return []
+
+        async def fetch_threads():
+            threads_started.set()
+            await messages_started.wait()
+            return []
+
+        app._fetch_messages = AsyncMock(side_effect=fetch_messages)
+        app._fetch_threads = AsyncMock(side_effect=fetch_threads)
+
+        async def stop_after_one_tick(*_args, **_kwargs):
+            app._polling = False
+
+        with (
+            patch.object(app, "_wait_for_poll", new=AsyncMock(side_effect=stop_after_one_tick)),
+            patch("matty.tui._sync_client", new_callable=AsyncMock),
+        ):
+            # A serial implementation would deadlock here, so bound the wait.
+            await asyncio.wait_for(MattyApp._poll_messages.__wrapped__(app), timeout=1.0)
+
+        app._show_threads.assert_called_once_with([])
 
     async def test_poll_discards_stale_results_after_room_switch(self, tui_config):
         """Poll results fetched for one room should be discarded if the user
@@ -577,7 +811,8 @@ class TestMattyAppAsync:
         app.client = AsyncMock()
         app._polling = True
         app._render_messages = MagicMock()
-        app._refresh_threads = AsyncMock()
+        app._fetch_threads = AsyncMock(return_value=[])
+        app._show_threads = MagicMock()
 
         async def switch_room_during_fetch(*_args, **_kwargs):
             """Simulate the user switching rooms while fetch is in flight."""
@@ -590,7 +825,7 @@ class TestMattyAppAsync:
             app._polling = False
 
         with (
-            patch("matty.tui.asyncio.sleep", new=AsyncMock(side_effect=stop_after_one_tick)),
+            patch.object(app, "_wait_for_poll", new=AsyncMock(side_effect=stop_after_one_tick)),
             patch("matty.tui._sync_client", new_callable=AsyncMock),
         ):
             await MattyApp._poll_messages.__wrapped__(app)
@@ -598,7 +833,183 @@ class TestMattyAppAsync:
         # The stale results should NOT have been applied
         assert app.messages == [old_message]
         app._render_messages.assert_not_called()
-        app._refresh_threads.assert_not_called()
+        app._show_threads.assert_not_called()
+
+    async def test_select_room_loads_messages_and_threads_concurrently(self, tui_config):
+        """Room switch should overlap the message and thread fetches."""
+        app = MattyApp(config=tui_config)
+        messages_started = asyncio.Event()
+        threads_started = asyncio.Event()
+
+        async def fetch_messages():
+            messages_started.set()
+            await threads_started.wait()
+
+        async def fetch_threads():
+            threads_started.set()
+            await messages_started.wait()
+
+        async with app.run_test(size=(120, 40)):
+            app._refresh_messages = AsyncMock(side_effect=fetch_messages)
+            app._refresh_threads = AsyncMock(side_effect=fetch_threads)
+
+            # A serial implementation would deadlock here, so bound the wait.
+            room = Room(room_id="!lobby:test.org", name="Lobby", member_count=5)
+            await asyncio.wait_for(app._select_room(room), timeout=1.0)
+
+            app._refresh_messages.assert_awaited_once()
+            app._refresh_threads.assert_awaited_once()
+
+    async def test_rapid_room_selections_coalesce(self, tui_config, tui_rooms):
+        """Selecting several rooms in quick succession should load only the last."""
+        app = MattyApp(config=tui_config)
+
+        async with app.run_test(size=(120, 40)) as pilot:
+            app._select_room = AsyncMock()
+
+            workers = [app._open_selection(room, None) for room in [*tui_rooms, tui_rooms[0]]]
+            await workers[-1].wait()
+            await pilot.pause()
+
+            app._select_room.assert_awaited_once_with(tui_rooms[0])
+
+    async def test_refresh_messages_skips_render_when_unchanged(self, tui_config, tui_messages):
+        """Refetching identical messages for the same view should not redraw the pane."""
+        app = MattyApp(config=tui_config)
+
+        async with app.run_test(size=(120, 40)):
+            app.client = AsyncMock()
+            app.current_room_id = "!lobby:test.org"
+            app._fetch_messages = AsyncMock(return_value=tui_messages)
+
+            with patch.object(app, "_render_messages", wraps=app._render_messages) as render:
+                await app._refresh_messages()
+                await app._refresh_messages()
+                assert render.call_count == 1
+
+                app.current_thread_id = "$ev1"
+                await app._refresh_messages()
+                assert render.call_count == 2
+
+    async def test_refresh_messages_appends_only_new_messages(self, tui_config, tui_messages):
+        """New messages at the end should be appended instead of redrawing the pane."""
+        app = MattyApp(config=tui_config)
+        reply = Message(
+            sender="@bot:test.org",
+            content="Another one",
+            timestamp=datetime(2024, 1, 15, 14, 32, tzinfo=UTC),
+            room_id="!lobby:test.org",
+            event_id="$ev3",
+            handle="m3",
+        )
+
+        async with app.run_test(size=(120, 40)):
+            app.client = AsyncMock()
+            app.current_room_id = "!lobby:test.org"
+            app._fetch_messages = AsyncMock(return_value=tui_messages)
+            await app._refresh_messages()
+
+            app._fetch_messages = AsyncMock(return_value=[*tui_messages, reply])
+            with (
+                patch.object(app, "_render_messages") as render,
+                patch.object(app, "_write_messages") as write,
+            ):
+                await app._refresh_messages()
+
+            render.assert_not_called()
+            write.assert_called_once_with([reply])
+            assert app.messages == [*tui_messages, reply]
+
+    async def test_refresh_messages_redraws_once_pane_is_full(self, tui_config, tui_messages):
+        """Appending stops once the pane holds too many messages, bounding its size."""
+        app = MattyApp(config=tui_config)
+        reply = Message(
+            sender="@bot:test.org",
+            content="Another one",
+            timestamp=datetime(2024, 1, 15, 14, 32, tzinfo=UTC),
+            room_id="!lobby:test.org",
+            event_id="$ev3",
+            handle="m3",
+        )
+
+        async with app.run_test(size=(120, 40)):
+            app.client = AsyncMock()
+            app.current_room_id = "!lobby:test.org"
+            app._fetch_messages = AsyncMock(return_value=tui_messages)
+            await app._refresh_messages()
+            app._pane_message_count = _MAX_PANE_MESSAGES
+
+            app._fetch_messages = AsyncMock(return_value=[*tui_messages, reply])
+            await app._refresh_messages()
+
+            assert app._pane_message_count == len(tui_messages) + 1
+
+    async def test_refresh_threads_keeps_widgets_when_unchanged(self, tui_config, tui_messages):
+        """Polling identical threads should not rebuild the thread sidebar."""
+        app = MattyApp(config=tui_config)
+
+        with patch("matty.tui._get_threads", new_callable=AsyncMock, return_value=tui_messages):
+            async with app.run_test(size=(120, 40)) as pilot:
+                app.client = AsyncMock()
+                app.current_room_id = "!lobby:test.org"
+                thread_list = app.query_one("#thread-list", ListView)
+
+                await app._refresh_threads()
+                await pilot.pause()
+                first_items = list(thread_list.children)
+
+                await app._refresh_threads()
+                await pilot.pause()
+
+                assert len(first_items) == 2
+                assert list(thread_list.children) == first_items
+
+    async def test_refresh_does_not_reload_rooms(self, tui_config):
+        """Ctrl+R should reload the open room only, skipping hidden threads."""
+        app = MattyApp(config=tui_config)
+
+        with (
+            patch("matty.tui._sync_client", new_callable=AsyncMock),
+            patch("matty.tui._get_rooms", new_callable=AsyncMock) as mock_get_rooms,
+        ):
+            async with app.run_test(size=(120, 40)):
+                app.client = AsyncMock()
+                app._authenticated = True
+                app.current_room_id = "!lobby:test.org"
+                app._refresh_messages = AsyncMock()
+                app._refresh_threads = AsyncMock()
+                app.action_toggle_threads()
+
+                await app.action_refresh()
+
+                mock_get_rooms.assert_not_called()
+                app._refresh_messages.assert_awaited_once()
+                app._refresh_threads.assert_not_called()
+
+    async def test_refresh_rooms_reloads_room_list(self, tui_config, tui_rooms):
+        """F5 should reload the sidebar and keep the active room selected."""
+        app = MattyApp(config=tui_config)
+        new_room = Room(room_id="!new:test.org", name="Announcements", member_count=1)
+
+        with patch(
+            "matty.tui._get_rooms", new_callable=AsyncMock, return_value=[*tui_rooms, new_room]
+        ):
+            async with app.run_test(size=(120, 40)) as pilot:
+                app.client = AsyncMock()
+                app._authenticated = True
+                app.rooms = tui_rooms
+                await app._populate_room_list()
+                app.current_room_id = "!lobby:test.org"
+                await pilot.pause()
+
+                await app.action_refresh_rooms()
+                await pilot.pause()
+
+                room_list = app.query_one("#room-list", ListView)
+                assert len(room_list.children) == 3
+                selected_item = room_list.children[room_list.index]
+                assert isinstance(selected_item, RoomItem)
+                assert selected_item.room.room_id == "!lobby:test.org"
 
     async def test_refresh_forces_reconnect_after_poll_failures(self, tui_config):
         """Ctrl+R should force a full reconnect when poll failures exceed threshold."""
@@ -1140,36 +1551,79 @@ class TestReactionsEqual:
 class TestNewMessageIds:
     """Tests for _new_message_ids helper."""
 
-    def _msg(self, event_id: str) -> Message:
-        return Message(
-            sender="@a:x",
-            content="hi",
-            timestamp=datetime(2024, 1, 1, tzinfo=UTC),
-            room_id="!r:x",
-            event_id=event_id,
-        )
-
     def test_new_ids_detected(self):
-        old = [self._msg("$1"), self._msg("$2")]
-        new = [self._msg("$2"), self._msg("$3")]
+        old = [_MSG_1, _MSG_2]
+        new = [_MSG_2, _MSG_3]
         assert _new_message_ids(old, new) == {"$3"}
 
     def test_no_new_ids(self):
-        old = [self._msg("$1"), self._msg("$2")]
-        new = [self._msg("$1"), self._msg("$2")]
+        old = [_MSG_1, _MSG_2]
+        new = [_MSG_1, _MSG_2]
         assert _new_message_ids(old, new) == set()
 
     def test_all_new(self):
-        old = [self._msg("$1")]
-        new = [self._msg("$2"), self._msg("$3")]
+        old = [_MSG_1]
+        new = [_MSG_2, _MSG_3]
         assert _new_message_ids(old, new) == {"$2", "$3"}
 
     def test_empty_old(self):
         old: list[Message] = []
-        new = [self._msg("$1")]
+        new = [_MSG_1]
         assert _new_message_ids(old, new) == {"$1"}
 
 
+class TestSyncHasRoomEvents:
+    """Tests for _sync_has_room_events helper."""
+
+    def _sync(self, join: dict) -> MagicMock:
+        response = MagicMock(spec=SyncResponse)
+        response.rooms = MagicMock(join=join)
+        return response
+
+    def test_room_with_timeline_events(self):
+        room = MagicMock()
+        room.timeline.events = [MagicMock()]
+        assert _sync_has_room_events(self._sync({"!r:x": room}), "!r:x")
+
+    def test_room_with_empty_timeline(self):
+        room = MagicMock()
+        room.timeline.events = []
+        assert not _sync_has_room_events(self._sync({"!r:x": room}), "!r:x")
+
+    def test_room_absent_from_sync(self):
+        assert not _sync_has_room_events(self._sync({}), "!r:x")
+
+    def test_failed_sync_assumes_changes(self):
+        assert _sync_has_room_events(None, "!r:x")
+
+
+class TestAppendedMessages:
+    """Tests for _appended_messages helper."""
+
+    def test_pure_append(self):
+        old = [_MSG_1, _MSG_2]
+        new = [_MSG_1, _MSG_2, _MSG_3]
+        assert [m.event_id for m in _appended_messages(old, new)] == ["$3"]
+
+    def test_append_with_oldest_evicted(self):
+        old = [_MSG_1, _MSG_2]
+        new = [_MSG_2, _MSG_3]
+        assert [m.event_id for m in _appended_messages(old, new)] == ["$3"]
+
+    def test_edited_message_is_not_append(self):
+        old = [_MSG_1, _MSG_2]
+        new = [_msg("$1", "edited"), _MSG_2, _MSG_3]
+        assert _appended_messages(old, new) is None
+
+    def test_last_message_missing_is_not_append(self):
+        old = [_MSG_1, _MSG_2]
+        new = [_MSG_1, _MSG_3]
+        assert _appended_messages(old, new) is None
+
+    def test_empty_old_is_not_append(self):
+        assert _appended_messages([], [_MSG_1]) is None
+
+
 class TestMessagesChangedReactionOrder:
     """Tests that _messages_changed handles reaction user list order correctly."""
 
@@ -1244,7 +1698,8 @@ class TestNotificationDetection:
         app._polling = True
         app._fetch_messages = AsyncMock(return_value=new_messages)
         app._render_messages = MagicMock()
-        app._refresh_threads = AsyncMock()
+        app._fetch_threads = AsyncMock(return_value=[])
+        app._show_threads = MagicMock()
 
         notifications = []
 
@@ -1257,7 +1712,7 @@ class TestNotificationDetection:
             app._polling = False
 
         with (
-            patch("matty.tui.asyncio.sleep", new=AsyncMock(side_effect=stop_after_one_tick)),
+            patch.object(app, "_wait_for_poll", new=AsyncMock(side_effect=stop_after_one_tick)),
             patch("matty.tui._sync_client", new_callable=AsyncMock),
         ):
             await MattyApp._poll_messages.__wrapped__(app)
@@ -1309,6 +1764,9 @@ class TestSendMessageMentions:
                     thread_root_id=None,
                     mentions=True,
                 )
+                # The poll loop, not the send worker, shows the sent message
+                assert app._poll_wakeup.is_set()
+                app._refresh_messages.assert_not_called()
 
 
 class TestMentionAutocompleteEdgeCases: